@@ -13,9 +13,11 @@ def create_app() -> Flask:
     for ext in exts:
         ext.init_app(_app)
         
-    from cmd import rescan, clean_sound 
+    from cmd import rescan, clean_sound, export_snapshot, load_snapshot
     _app.cli.add_command(clean_sound)
     _app.cli.add_command(rescan)
+    _app.cli.add_command(export_snapshot)
+    _app.cli.add_command(load_snapshot)
     
     import controllers
     return _app
@@ -0,0 +1,91 @@
+"""
+异步服务模式：uvicorn asgi:app --host 0.0.0.0 --port 4321
+
+/api/file 和目录浏览在事件循环里用 OpenDAL AsyncOperator 非阻塞读取，
+其余接口挂载原 Flask 应用，连同 DuckDB 查询一起放在有界线程池里执行，
+大量慢速预览流不会占住处理元数据查询的线程。
+"""
+import asyncio
+import mimetypes
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+from app import app as flask_app
+from config import ASYNC_DB_WORKERS
+from core.browser import AsyncBrowser
+from core.metrics import metrics
+from extensions.ext_duck import db_sound
+from extensions.ext_opendal import storage
+
+db_executor = ThreadPoolExecutor(max_workers=ASYNC_DB_WORKERS, thread_name_prefix="duckdb")
+
+
+async def run_db(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(db_executor, func, *args)
+
+
+def _observe(endpoint, method, start, status=200):
+    metrics.observe("catchsound_request_seconds", time.perf_counter() - start, endpoint=endpoint, method=method)
+    metrics.inc("catchsound_requests_total", endpoint=endpoint, method=method, status=status)
+
+
+async def _measured_stream(gen, ext):
+    start = time.perf_counter()
+    sent = 0
+    try:
+        async for chunk in gen:
+            sent += len(chunk)
+            yield chunk
+    finally:
+        metrics.inc("catchsound_file_bytes_total", sent, ext=ext)
+        metrics.inc("catchsound_file_streams_total", ext=ext)
+        metrics.observe("catchsound_file_stream_seconds", time.perf_counter() - start, ext=ext)
+
+
+async def file_preview(request):
+    start = time.perf_counter()
+    path = request.query_params.get("path", "").strip("/")
+    if path:
+        # 缓存命中时直接在事件循环里拿到元数据，不占数据库线程
+        info = db_sound.get_cached_by_path(path) or await run_db(db_sound.get_sound_by_path, path)
+        if info:
+            info = info[0]
+            mime_type = mimetypes.guess_type(f"file{info['ext']}")[0]
+            _observe("/api/file", "GET", start)
+            accel = storage.accel_path(path)
+            if accel:
+                metrics.inc("catchsound_file_redirects_total", ext=info["ext"])
+                return Response(headers={"X-Accel-Redirect": accel}, media_type=mime_type)
+            return StreamingResponse(_measured_stream(storage.aload_stream(path), info["ext"]), media_type=mime_type)
+    _observe("/api/file", "GET", start)
+    return JSONResponse({})
+
+
+async def tree_folder_content(request):
+    start = time.perf_counter()
+    payload = await request.json()
+    result = await AsyncBrowser.contents(path=payload.get("path", "").strip("/"))
+    _observe("/api/tree/folder/content", "POST", start)
+    return JSONResponse(result)
+
+
+async def tree_file_branch(request):
+    start = time.perf_counter()
+    payload = await request.json()
+    path = payload.get("path", "").strip("/")
+    result = await AsyncBrowser.branch(filepath=path) if path else []
+    _observe("/api/tree/file/branch", "POST", start)
+    return JSONResponse(result)
+
+
+app = Starlette(routes=[
+    Route("/api/file", file_preview, methods=["GET"]),
+    Route("/api/tree/folder/content", tree_folder_content, methods=["POST"]),
+    Route("/api/tree/file/branch", tree_file_branch, methods=["POST"]),
+    Mount("/", WSGIMiddleware(flask_app, workers=ASYNC_DB_WORKERS)),
+])
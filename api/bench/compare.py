@@ -0,0 +1,38 @@
+"""
+对比两份 bench/run.py 报告的数值指标
+
+    python bench/compare.py base.json new.json
+"""
+import json
+import sys
+
+
+def flatten(node, prefix=""):
+    if isinstance(node, dict):
+        for k, v in node.items():
+            if k != "meta":
+                yield from flatten(v, f"{prefix}.{k}" if prefix else k)
+    elif isinstance(node, (int, float)) and not isinstance(node, bool):
+        yield prefix, node
+
+
+def main(base_path, new_path):
+    with open(base_path) as f:
+        base = dict(flatten(json.load(f)))
+    with open(new_path) as f:
+        new = dict(flatten(json.load(f)))
+
+    width = max(len(k) for k in base.keys() | new.keys())
+    for key in sorted(base.keys() | new.keys()):
+        a, b = base.get(key), new.get(key)
+        if a is None or b is None:
+            print(f"{key:<{width}}  {a!s:>14}  {b!s:>14}")
+            continue
+        delta = f"{(b - a) * 100.0 / a:+.1f}%" if a else ""
+        print(f"{key:<{width}}  {a:>14}  {b:>14}  {delta:>8}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(__doc__)
+    main(sys.argv[1], sys.argv[2])
@@ -0,0 +1,155 @@
+"""
+生成合成采样库：可配置文件数 / 目录深度，包名和文件名模仿真实采样包（含中文和和弦调性），
+音频是极小但合法的 WAV / MP3 / FLAC，可被 TinyTag / mutagen / soundfile 正常解析。
+
+    python bench/gen_library.py /tmp/catchsound_lib --files 20000 --depth 3
+"""
+import argparse
+import io
+import os
+import random
+import struct
+
+import numpy as np
+import soundfile as sf
+
+PACK_PREFIX = [
+    "Vengeance", "Cymatics", "Loopmasters", "Black Octopus", "808 Mafia", "KSHMR",
+    "Production Master", "Samplephonics", "Function Loops", "Ghosthack",
+]
+PACK_STYLE = [
+    "Essential House Vol.3", "Future Bass", "Lo-Fi Hip Hop", "Dark Techno", "Cinematic Trailer",
+    "Trap Drum Kit", "Afrobeat Grooves", "Synthwave Nights", "Deep Dubstep", "Ambient Textures",
+]
+CHINESE_PACKS = ["国风古筝采样包", "中国鼓乐器合集", "电子舞曲素材", "二胡旋律Loop", "琵琶一击音色", "古风人声采样"]
+SUB_DIRS = [
+    "Drums", "Kicks", "Snares", "Hi Hats", "Loops", "One Shots", "Bass", "Synth", "FX",
+    "Vocals", "Melodic Loops", "Percussion", "808s", "Pads", "打击乐", "旋律",
+]
+INSTRUMENTS = [
+    "Kick", "Snare", "Clap", "Hat", "Perc", "Bass", "Pluck", "Pad", "Lead", "Vox",
+    "Piano", "Guitar", "808", "Riser", "Impact", "Rhodes", "Strings", "Brass",
+]
+CHINESE_WORDS = ["古筝", "大鼓", "贝斯", "合成器", "人声", "氛围", "琵琶", "二胡"]
+DESCRIPTORS = ["Punchy", "Dark", "Warm", "Bright", "Dirty", "Deep", "Wide", "Analog", "Vintage", "Hard"]
+NOTES = ["C", "C#", "Db", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B"]
+KEY_SUFFIX = ["min", "maj", "m", " Minor", " Major", "", "Min"]
+KINDS = ["Loop", "One Shot", "Shot", "", ""]
+SEPARATORS = [" ", "_", "-"]
+EXTS = [".wav", ".wav", ".wav", ".mp3", ".flac"]
+
+SAMPLE_RATE = 22050
+
+
+def _wav_bytes(pcm):
+    data = pcm.tobytes()
+    header = b"RIFF" + struct.pack("<I", 36 + len(data)) + b"WAVE"
+    header += b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, SAMPLE_RATE, SAMPLE_RATE * 2, 2, 16)
+    header += b"data" + struct.pack("<I", len(data))
+    return header + data
+
+
+def _id3_frame(frame_id, text):
+    body = b"\x00" + text.encode("latin-1")
+    return frame_id.encode("ascii") + struct.pack(">I", len(body)) + b"\x00\x00" + body
+
+
+def _mp3_bytes(index, bpm):
+    # ID3v2.3 标签（BPM + 唯一标题）+ 若干帧静音的 MPEG-1 Layer III 128kbps/44.1kHz 帧
+    frames = _id3_frame("TBPM", str(bpm)) + _id3_frame("TIT2", f"sample {index}")
+    size = len(frames)
+    syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    tag = b"ID3\x03\x00\x00" + syncsafe + frames
+    frame = b"\xff\xfb\x90\x64" + b"\x00" * 413
+    return tag + frame * 8
+
+
+def _flac_bytes(pcm):
+    buf = io.BytesIO()
+    sf.write(buf, pcm, SAMPLE_RATE, format="FLAC", subtype="PCM_16")
+    return buf.getvalue()
+
+
+def _pcm(rng, index, n_samples):
+    t = np.arange(n_samples) / SAMPLE_RATE
+    freq = rng.uniform(40, 4000)
+    tone = np.sin(2 * np.pi * freq * t) * np.exp(-t * rng.uniform(1, 40))
+    noise = rng.standard_normal(n_samples) * rng.uniform(0, 0.3)
+    pcm = ((tone + noise) * 0.5 * 32767).clip(-32768, 32767).astype("<i2")
+    # 首个采样写入序号，保证每个文件内容唯一，重复文件只来自 dup_ratio
+    pcm[0] = index % 32768
+    return pcm
+
+
+def _pack_name(rng):
+    if rng.random() < 0.15:
+        return rng.choice(CHINESE_PACKS)
+    return f"{rng.choice(PACK_PREFIX)} - {rng.choice(PACK_STYLE)}"
+
+
+def _file_stem(rng, index):
+    sep = rng.choice(SEPARATORS)
+    parts = []
+    if rng.random() < 0.1:
+        parts.append(rng.choice(CHINESE_WORDS))
+    parts += [rng.choice(INSTRUMENTS), rng.choice(DESCRIPTORS), f"{index:06d}"]
+    if rng.random() < 0.5:
+        parts.append(f"{rng.randint(70, 175)}bpm")
+    if rng.random() < 0.6:
+        parts.append(rng.choice(NOTES) + rng.choice(KEY_SUFFIX))
+    kind = rng.choice(KINDS)
+    if kind:
+        parts.append(kind)
+    return sep.join(parts)
+
+
+def generate(root, n_files=1000, depth=3, files_per_dir=40, dup_ratio=0.1, seed=42, duration=0.1):
+    """生成采样库，返回 {"files", "dirs", "duplicates", "bytes"}；duration 为 WAV/FLAC 的秒数"""
+    rng = random.Random(seed)
+    n_samples = max(1, int(SAMPLE_RATE * duration))
+    np_rng = np.random.default_rng(seed)
+
+    n_dirs = max(1, n_files // files_per_dir)
+    dirs = []
+    for _ in range(n_dirs):
+        levels = [_pack_name(rng)] + [rng.choice(SUB_DIRS) for _ in range(rng.randint(0, max(0, depth - 1)))]
+        dirs.append(os.path.join(root, *levels))
+    for d in set(dirs):
+        os.makedirs(d, exist_ok=True)
+
+    written = {}
+    total_bytes = 0
+    duplicates = 0
+    for index in range(n_files):
+        ext = rng.choice(EXTS)
+        path = os.path.join(rng.choice(dirs), _file_stem(rng, index) + ext)
+        if written.get(ext) and rng.random() < dup_ratio:
+            data = rng.choice(written[ext])
+            duplicates += 1
+        elif ext == ".wav":
+            data = _wav_bytes(_pcm(np_rng, index, n_samples))
+        elif ext == ".mp3":
+            data = _mp3_bytes(index, rng.randint(70, 175))
+        else:
+            data = _flac_bytes(_pcm(np_rng, index, n_samples))
+        written.setdefault(ext, [])
+        if len(written[ext]) < 200:
+            written[ext].append(data)
+        with open(path, "wb") as f:
+            f.write(data)
+        total_bytes += len(data)
+
+    return {"files": n_files, "dirs": len(set(dirs)), "duplicates": duplicates, "bytes": total_bytes}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="generate a synthetic sample library")
+    parser.add_argument("root")
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--files-per-dir", type=int, default=40)
+    parser.add_argument("--dup-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--duration", type=float, default=0.1, help="seconds of audio per wav/flac file")
+    args = parser.parse_args()
+    print(generate(args.root, args.files, args.depth, args.files_per_dir, args.dup_ratio, args.seed, args.duration))
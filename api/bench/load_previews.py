@@ -0,0 +1,115 @@
+"""
+预览并发压测：先测空载下 /api/sounds 的延迟，再挂上大量慢速读取的 /api/file 预览流，
+测同样的查询在负载下的延迟，对比 flask run 和 uvicorn asgi:app 两种服务模式。
+
+    python bench/load_previews.py --url http://127.0.0.1:4321 --previews 300
+
+--preview-url 指向 nginx 时预览流走 X-Accel-Redirect，可以和直接由 API 发送的对比。
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from run import _request, run_scenario  # noqa: E402
+
+
+def _preview_worker(base, files, stop, stats, lock, chunk, delay):
+    """模拟慢速客户端：每读一块就停一会，长时间占住一个预览流"""
+    rng = random.Random()
+    while not stop.is_set():
+        url = base + "/file?" + urllib.parse.urlencode({"path": rng.choice(files)})
+        try:
+            with urllib.request.urlopen(url, timeout=120) as resp:
+                while not stop.is_set():
+                    data = resp.read(chunk)
+                    if not data:
+                        break
+                    with lock:
+                        stats["bytes"] += len(data)
+                    time.sleep(delay)
+            with lock:
+                stats["streams"] += 1
+        except Exception:
+            with lock:
+                stats["errors"] += 1
+            time.sleep(delay)
+
+
+def _preview_process(base, files, n_streams, chunk, delay, stop, result):
+    """预览流跑在独立进程里，避免和测延迟的线程抢 GIL 而污染测量结果"""
+    stop_event = threading.Event()
+    lock = threading.Lock()
+    stats = {"bytes": 0, "streams": 0, "errors": 0}
+    workers = [
+        threading.Thread(target=_preview_worker, daemon=True,
+                         args=(base, files, stop_event, stats, lock, chunk, delay))
+        for _ in range(n_streams)
+    ]
+    for worker in workers:
+        worker.start()
+    stop.wait()
+    stop_event.set()
+    for worker in workers:
+        worker.join(timeout=5)
+    result.update(stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="concurrent preview load test")
+    parser.add_argument("--url", default="http://127.0.0.1:4321")
+    parser.add_argument("--previews", type=int, default=300, help="concurrent preview streams")
+    parser.add_argument("--requests", type=int, default=200, help="/api/sounds requests per phase")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--chunk", type=int, default=16 * 1024)
+    parser.add_argument("--delay", type=float, default=0.02, help="seconds a preview client sleeps per chunk")
+    parser.add_argument("--preview-url", default="", help="serve previews from another server (defaults to --url)")
+    parser.add_argument("--out", default="load_previews_report.json")
+    args = parser.parse_args()
+
+    base = args.url.rstrip("/") + "/api"
+    with urllib.request.urlopen(urllib.request.Request(
+            base + "/sounds", data=json.dumps({"limit": 500}).encode("utf-8"),
+            headers={"Content-Type": "application/json"})) as resp:
+        rows = json.loads(resp.read())
+    # 优先挑大文件，流才会持续得足够久
+    files = [row["rel_path"] for row in sorted(rows, key=lambda r: -int(r["size"] or 0))[:100]]
+    tags = sorted({tag for row in rows for tag in row["tags"]})[:20] or [""]
+
+    def sounds(i):
+        return _request(base + "/sounds", {"tags": [tags[i % len(tags)]], "limit": 50})
+
+    preview_base = (args.preview_url or args.url).rstrip("/") + "/api"
+    report = {"url": args.url, "preview_url": args.preview_url or args.url, "previews": args.previews}
+    report["idle"] = run_scenario(sounds, args.requests, args.concurrency)
+
+    manager = multiprocessing.Manager()
+    stop = manager.Event()
+    stats = manager.dict()
+    loader = multiprocessing.Process(
+        target=_preview_process, args=(preview_base, files, args.previews, args.chunk, args.delay, stop, stats)
+    )
+    start = time.perf_counter()
+    loader.start()
+    time.sleep(2)
+    report["under_load"] = run_scenario(sounds, args.requests, args.concurrency)
+    stop.set()
+    loader.join()
+    elapsed = time.perf_counter() - start
+    stats = dict(stats)
+    report["preview_streams"] = dict(stats, mbytes_per_sec=round(stats["bytes"] / elapsed / 1e6, 2))
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(json.dumps(report, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
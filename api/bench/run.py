@@ -0,0 +1,241 @@
+"""
+CatchSound 基准测试：生成合成采样库 -> 冷扫描 / 重扫 -> 起服务压测接口，输出可在提交间 diff 的 json 报告。
+
+    python bench/run.py --files 20000 --out bench_report.json
+    python bench/compare.py base.json bench_report.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from gen_library import generate  # noqa: E402
+from startup import bench_startup  # noqa: E402
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 前端列表页实际用到的列
+LIST_FIELDS = ["uid", "name", "rel_path", "duration", "bpm", "key", "oneshot", "tags"]
+
+
+def _percentiles(values):
+    if not values:
+        return {"n": 0}
+    values = sorted(values)
+
+    def pick(q):
+        return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 3)
+
+    return {
+        "n": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 3),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": round(values[-1] * 1000, 3),
+    }
+
+
+def _run_flask(env, *args):
+    """在子进程里执行 flask 命令，用 wait4 拿到该子进程自己的峰值 RSS"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "flask", "--app", "app", *args],
+                            cwd=API_DIR, env=env, stdout=subprocess.DEVNULL)
+    _, status, rusage = os.wait4(proc.pid, 0)
+    if status != 0:
+        raise RuntimeError(f"flask {' '.join(args)} exited with {status}")
+    return time.perf_counter() - start, rusage.ru_maxrss * 1024
+
+
+def _db_size(data_dir):
+    return sum(
+        os.path.getsize(os.path.join(data_dir, name))
+        for name in os.listdir(data_dir) if name.startswith("sound.")
+    )
+
+
+def bench_scan(env, data_dir, n_files):
+    report = {}
+    for phase in ["cold", "rescan"]:
+        seconds, peak_rss = _run_flask(env, "rescan")
+        with open(os.path.join(data_dir, "scan_status.json")) as f:
+            status = json.load(f)
+        report[phase] = {
+            "seconds": round(seconds, 3),
+            "files_per_sec": round(n_files / seconds, 2),
+            "peak_rss_bytes": peak_rss,
+            "processed": status["processed"],
+            "failed": status["failed"],
+            "counters": status["counters"],
+            "stages": {k: {"avg": v["avg"], "p95": v["p95"], "sum": v["sum"]} for k, v in status["stages"].items()},
+        }
+    report["db_bytes"] = _db_size(data_dir)
+    return report
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _request(url, payload=None, headers=None):
+    data = None if payload is None else json.dumps(payload).encode("utf-8")
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json", **(headers or {})})
+    start = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=60) as resp:
+        body = resp.read()
+    return time.perf_counter() - start, len(body)
+
+
+def _wait_ready(base, proc, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("api server exited during startup")
+        try:
+            _request(base + "/tags", {})
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("api server did not start")
+
+
+def run_scenario(fn, n_requests, concurrency):
+    latencies, sizes, errors = [], [], 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(fn, i) for i in range(n_requests)]:
+            try:
+                seconds, size = future.result()
+                latencies.append(seconds)
+                sizes.append(size)
+            except Exception:
+                errors += 1
+    wall = time.perf_counter() - start
+    result = _percentiles(latencies)
+    result.update({
+        "errors": errors,
+        "rps": round(len(latencies) / wall, 2),
+        "avg_bytes": round(sum(sizes) / len(sizes), 1) if sizes else 0,
+    })
+    return result
+
+
+def bench_api(env, n_files, n_requests, concurrency, seed):
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}/api"
+    proc = subprocess.Popen([sys.executable, "-m", "flask", "--app", "app", "run", "--port", str(port)],
+                            cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_ready(base, proc)
+        rng = random.Random(seed)
+        with urllib.request.urlopen(urllib.request.Request(
+                base + "/sounds", data=json.dumps({"limit": 2000}).encode("utf-8"),
+                headers={"Content-Type": "application/json"})) as resp:
+            rows = json.loads(resp.read())
+        files = [row["rel_path"] for row in rows]
+        folders = sorted({os.path.dirname(p) for p in files if os.path.dirname(p)})
+        tag_count = {}
+        for row in rows:
+            for tag in row["tags"]:
+                tag_count[tag] = tag_count.get(tag, 0) + 1
+        tags = [t for t, _ in sorted(tag_count.items(), key=lambda x: -x[1])[:20]]
+
+        def tag_pair():
+            return rng.sample(tags, min(2, len(tags)))
+
+        # 列表页：500 行一页，对比全部列 JSON / 只取列表用到的列 / 按列编码 / MessagePack
+        page = {"limit": 500, "offset": 0}
+        list_fields = {"fields": LIST_FIELDS}
+        msgpack_accept = {"Accept": "application/x-msgpack"}
+
+        scenarios = {
+            "sounds_and": lambda i: _request(base + "/sounds", {"tags": tag_pair(), "op": "AND"}),
+            "sounds_or": lambda i: _request(base + "/sounds", {"tags": tag_pair(), "op": "OR"}),
+            "sounds_rand": lambda i: _request(base + "/sounds", {"tags": tag_pair()[:1], "rand": True}),
+            "sounds_deep": lambda i: _request(base + "/sounds", {"offset": int(n_files * 0.9)}),
+            "sounds_page_full": lambda i: _request(base + "/sounds", page),
+            "sounds_page_fields": lambda i: _request(base + "/sounds", {**page, **list_fields}),
+            "sounds_page_columnar": lambda i: _request(base + "/sounds", {**page, **list_fields, "layout": "columnar"}),
+            "sounds_page_msgpack": lambda i: _request(base + "/sounds", {**page, **list_fields}, msgpack_accept),
+            "sounds_page_msgpack_columnar": lambda i: _request(
+                base + "/sounds", {**page, **list_fields, "layout": "columnar"}, msgpack_accept),
+            "tree_content": lambda i: _request(base + "/tree/folder/content", {"path": rng.choice(folders)}),
+            "tree_branch": lambda i: _request(base + "/tree/file/branch", {"path": rng.choice(files)}),
+            "file": lambda i: _request(base + "/file?" + urllib.parse.urlencode({"path": rng.choice(files)})),
+        }
+        return {name: run_scenario(fn, n_requests, concurrency) for name, fn in scenarios.items()}
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=API_DIR, text=True).strip()
+    except Exception:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CatchSound benchmark suite")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--dup-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=200, help="requests per api scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workdir", help="keep library and db here instead of a temp dir")
+    parser.add_argument("--out", default="bench_report.json")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="catchsound_bench_")
+    library_dir = os.path.join(workdir, "library")
+    data_dir = os.path.join(workdir, "data")
+    shutil.rmtree(data_dir, ignore_errors=True)
+    os.makedirs(data_dir)
+    env = dict(os.environ, CATCHSOUND_FS_ROOT=library_dir, CATCHSOUND_DATA_DIR=data_dir)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "args": vars(args),
+        }
+    }
+    try:
+        if not os.path.isdir(library_dir):
+            print(f"generating {args.files} files in {library_dir}")
+            report["library"] = generate(library_dir, args.files, args.depth, dup_ratio=args.dup_ratio, seed=args.seed)
+        print("measuring startup")
+        report["startup"] = bench_startup(env)
+        print("scanning")
+        report["scan"] = bench_scan(env, data_dir, args.files)
+        print("benchmarking api")
+        report["api"] = bench_api(env, args.files, args.requests, args.concurrency, args.seed)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True, ensure_ascii=False)
+    print(f"report written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+API 启动开销：在干净的子进程里 import app（即 create_app()），记录耗时、RSS 和加载了哪些重模块
+
+    python bench/startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app
+seconds = time.perf_counter() - start
+with open("/proc/self/statm") as f:
+    rss = int(f.read().split()[1]) * 4096
+heavy = [m for m in ("spacy", "jieba", "soundfile", "mutagen", "tinytag") if m in sys.modules]
+print(json.dumps({"seconds": seconds, "rss_bytes": rss, "heavy_modules": heavy}))
+"""
+
+
+def bench_startup(env=None, runs=5):
+    env = dict(env or os.environ)
+    if "CATCHSOUND_DATA_DIR" not in env:
+        env["CATCHSOUND_DATA_DIR"] = tempfile.mkdtemp(prefix="catchsound_startup_")
+    samples = []
+    for _ in range(runs):
+        out = subprocess.check_output([sys.executable, "-c", PROBE], cwd=API_DIR, env=env, text=True)
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    seconds = sorted(s["seconds"] for s in samples)
+    return {
+        "runs": runs,
+        "import_ms_min": round(seconds[0] * 1000, 1),
+        "import_ms_median": round(seconds[len(seconds) // 2] * 1000, 1),
+        "rss_bytes": max(s["rss_bytes"] for s in samples),
+        "heavy_modules": samples[0]["heavy_modules"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="measure import time and RSS of create_app()")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(bench_startup(runs=args.runs), indent=2))
@@ -1,8 +1,11 @@
 import click
+import json
 import os
-from config import DATA_DIR, OPENDAL_FS_ROOT
+import time
+import duckdb
+from config import DATA_DIR, LIBRARY_ROOTS, SOUND_DB_READ_ONLY
 from core.scaner import sound_scanner
-from extensions.ext_duck import db_sound
+from extensions.ext_duck import DuckDBWALManager, db_sound
 
 
 @click.command("clean_sound", help="clean sound db")
@@ -10,15 +13,141 @@ def clean_sound():
     os.system(f"rm -rf {DATA_DIR}/sound.*")
 
 
+def _check_roots(root_names):
+    unknown = set(root_names) - set(LIBRARY_ROOTS)
+    if unknown:
+        raise click.BadParameter(f"unknown roots: {', '.join(sorted(unknown))}", param_hint="--root")
+    return {name: path for name, path in LIBRARY_ROOTS.items() if not root_names or name in root_names}
+
+
+def _read_only(name):
+    """只读打开正式库，服务进程以读写方式占着文件时打不开，返回 None"""
+    shard = DuckDBWALManager(db_sound.shard(name).db_name, read_only=True)
+    if not os.path.exists(shard.db_path):
+        return None
+    try:
+        shard.conn
+    except duckdb.IOException as e:
+        print(f"⚠️ 无法只读打开 {shard.db_name}（服务进程需以 CATCHSOUND_READ_ONLY=1 启动）: {e}")
+        return None
+    return shard
+
+
 @click.command("rescan", help="rescan the audio folder, and init the duck db.")
-def rescan():
-    fs_gen = sound_scanner.scan(OPENDAL_FS_ROOT)
-    batch_rows = []
-    for row in fs_gen:
-        batch_rows.append(row)
-        if len(batch_rows) > 100000:
-            db_sound.batch_insert(batch_rows)
-            batch_rows = []
-    if batch_rows:
-        db_sound.batch_insert(batch_rows)
+@click.option("--profile", is_flag=True, help="sample the scan threads and dump a hot-path report to the data dir.")
+@click.option("--root", "root_names", multiple=True, help="only rescan these library roots (repeatable).")
+@click.option("--shadow", is_flag=True, help="build into a shadow db and swap it in atomically when a root is done.")
+def rescan(profile, root_names, shadow):
+    roots = _check_roots(root_names)
+    if SOUND_DB_READ_ONLY and not shadow:
+        # 只读打开的库写不进去，直接重扫只会得到一个空库
+        raise click.UsageError("the sound db is opened read-only (CATCHSOUND_READ_ONLY=1), rescan with --shadow")
+
+    if shadow:
+        # 不碰正式库的写锁：已有内容从只读连接取，新数据写进影子库
+        sources = [live for live in map(_read_only, roots) if live is not None]
+        targets = {name: db_sound.shard(name).shadow() for name in roots}
+    else:
+        sources = [db_sound]
+        targets = {name: db_sound.shard(name) for name in roots}
+
+    # 只常驻 content_hash -> uid，命中的文件再回库取元数据和特征
+    known = {}
+    for source in sources:
+        known.update(source.get_uids_by_content_hash())
+
+    def reuse(uid):
+        for source in sources:
+            row = source.get_reusable_by_uid(uid)
+            if row is not None:
+                return row
+        return None
+
+    sound_scanner.profile = profile
+    fs_gen = sound_scanner.scan(roots, known=known, reuse=reuse)
+    batches = {name: [] for name in roots}
+    written = {name: 0 for name in roots}
+    failed = set()
+
+    def flush(name):
+        # 某个根写入失败后不再写它，其余根照常扫完
+        if batches[name] and name not in failed:
+            try:
+                with sound_scanner.stats.timer("insert"):
+                    targets[name].batch_insert(batches[name])
+            except Exception as e:
+                failed.add(name)
+                print(f"❌ {name} 批量插入失败: {e}")
+            else:
+                written[name] += len(batches[name])
+        batches[name] = []
+
+    swapped = set()
+    for name, row in fs_gen:
+        # row 为 None 表示这个根已经扫完，先落库，不用等其他根
+        if row is None:
+            flush(name)
+            if shadow and name not in failed:
+                if written[name]:
+                    db_sound.shard(name).swap_in(targets[name])
+                    swapped.add(name)
+                    print(f"🔁 {name}: {written[name]} 条已替换为新索引")
+                else:
+                    print(f"⚠️ {name} 没有扫到文件，保留原索引")
+            continue
+        batches[name].append(row)
+        if len(batches[name]) > 100000:
+            flush(name)
+    for name in roots:
+        if shadow:
+            # 没扫完（遍历失败）或写入失败的根丢弃影子库，正式库保持不变
+            if name not in swapped:
+                targets[name].close()
+                if os.path.exists(targets[name].db_path):
+                    os.remove(targets[name].db_path)
+        else:
+            flush(name)
+    if shadow:
+        for live in sources:
+            live.close()
+    sound_scanner.stats.dump(force=True)
+    if failed:
+        raise click.ClickException(f"insert failed, index not updated for: {', '.join(sorted(failed))}")
+
+
+@click.command("export_snapshot", help="export the sound index as zstd parquet files plus a manifest.")
+@click.option("--out", "out_dir", default=os.path.join(DATA_DIR, "snapshot"), show_default=True)
+def export_snapshot(out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "roots": {}}
+    for name in LIBRARY_ROOTS:
+        live = _read_only(name)
+        if live is None:
+            continue
+        filename = live.db_name.removesuffix(".duck") + ".parquet"
+        start = time.time()
+        rows = live.export_parquet(os.path.join(out_dir, filename))
+        live.close()
+        manifest["roots"][name] = {"file": filename, "rows": rows}
+        size = os.path.getsize(os.path.join(out_dir, filename))
+        print(f"📦 {name}: {rows} 条 -> {filename} ({size / 1e6:.1f} MB, {time.time() - start:.2f} 秒)")
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
 
+@click.command("load_snapshot", help="build the sound index from a parquet snapshot and swap it in.")
+@click.argument("snapshot_dir")
+def load_snapshot(snapshot_dir):
+    with open(os.path.join(snapshot_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+    for name in LIBRARY_ROOTS:
+        entry = manifest["roots"].get(name)
+        if entry is None:
+            print(f"⚠️ 快照里没有 {name}，跳过")
+            continue
+        start = time.time()
+        shard = db_sound.shard(name)
+        target = shard.shadow()
+        rows = target.load_parquet(os.path.join(snapshot_dir, entry["file"]))
+        shard.swap_in(target)
+        print(f"📥 {name}: {rows} 条已载入 {shard.db_name}（{time.time() - start:.2f} 秒）")
@@ -2,7 +2,53 @@ import os
 
 BASE_DIR = os.path.dirname(__file__)
 
-DATA_DIR = os.path.join(BASE_DIR, "data")
+DATA_DIR = os.environ.get("CATCHSOUND_DATA_DIR", os.path.join(BASE_DIR, "data"))
 
 
-OPENDAL_FS_ROOT = "/data"
+OPENDAL_FS_ROOT = os.environ.get("CATCHSOUND_FS_ROOT", "/data")
+
+
+def _parse_roots(value):
+    roots = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, path = item.split("=", 1)
+            roots[name.strip().strip("/")] = path.strip()
+    return roots
+
+# 多个采样库根目录，如 CATCHSOUND_ROOTS="nas=/mnt/nas,ssd=/mnt/ssd"，未配置时只有 OPENDAL_FS_ROOT 一个根；
+# 多根时对外的路径以根名开头（nas/Drums/kick.wav），每个根一个 DuckDB 分片 sound.<name>.duck
+LIBRARY_ROOTS = _parse_roots(os.environ.get("CATCHSOUND_ROOTS", "")) or {"default": OPENDAL_FS_ROOT}
+
+# 跨分片查询时单个分片的超时（秒），超时的分片结果被丢弃，不拖住其他分片
+SHARD_TIMEOUT = 5.0
+
+# 每个分片单独的查询线程数，也是该分片同时在途的查询上限；慢的 NAS 分片占满后新查询直接跳过它，
+# 不会占用其他分片的线程
+SHARD_WORKERS = 4
+
+# 服务进程以只读方式打开采样库（只读副本），这样 rescan --shadow / export_snapshot 可以同时读取正式库
+SOUND_DB_READ_ONLY = os.environ.get("CATCHSOUND_READ_ONLY", "") == "1"
+
+# 服务进程每隔多少秒检查一次库文件是否被影子库替换，替换后自动重连
+SWAP_CHECK_INTERVAL = 1.0
+
+
+# 扫描时对采样指纹相同的文件再做全量哈希校验
+SCAN_VERIFY_HASH = False
+
+# 超过该耗时（毫秒）的查询连同 EXPLAIN ANALYZE 写入 data/slow_query.log
+SLOW_QUERY_MS = 200
+
+# 前面有 nginx 时设成内部 location 前缀（如 /_samples），/api/file 只查库并返回 X-Accel-Redirect，
+# 文件由 nginx 用 sendfile 直接发送，不经过 Python；nginx 配置见 docker/nginx.conf
+ACCEL_REDIRECT = os.environ.get("CATCHSOUND_ACCEL_REDIRECT", "")
+
+# asgi 模式下执行 Flask 接口（含全部 DuckDB 查询）的线程数
+ASYNC_DB_WORKERS = 8
+
+# 按 uid 缓存的采样元数据行数（预览、收藏、批量查询共用），库被替换或删除记录时清掉
+ROW_CACHE_SIZE = 4096
+
+# /api/sounds/batch 单次最多解析的路径 / uid 数
+BATCH_LOOKUP_LIMIT = 1000
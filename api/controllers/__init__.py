@@ -1,16 +1,23 @@
 from .tag import TagList
 from .browser import TreeFolderContent, TreeFileBranch
-from .sound import SoundList
+from .sound import SoundList, SoundBatch, SoundSimilar, SoundDuplicates
 from .file import FilePreview
 from .collection import CollectionSoundList, CollectionAdd, CollectionRemove
+from .scan import ScanStatus
+from .metrics import Metrics
 
 __all__ = [
     TagList,
     TreeFolderContent,
     TreeFileBranch,
     SoundList,
+    SoundBatch,
+    SoundSimilar,
+    SoundDuplicates,
     FilePreview,
     CollectionSoundList,
     CollectionAdd,
-    CollectionRemove
+    CollectionRemove,
+    ScanStatus,
+    Metrics,
 ]
@@ -2,7 +2,8 @@ import hashlib
 from flask_restx import Resource
 from extensions.ext_restx import api
 from flask import request
-from extensions.ext_duck import db_sound, db_collection
+from extensions.ext_duck import db_sound, db_collection, project_rows
+from core.encoding import to_columnar
 
 
 @api.route("/collection")
@@ -18,32 +19,40 @@ class CollectionSoundList(Resource):
         key=payload.get("key", "")
         op = payload.get("op", "AND")
         rand = payload.get("rand", False)
+        fields = payload.get("fields")
+        layout = payload.get("layout", "")
         if path:
             uid = hashlib.md5(path.encode("utf-8")).hexdigest()
-            return db_collection.get_sound_by_uid(uid)
+            rows = project_rows(db_collection.get_sound_by_uid(uid), fields)
         else:
             if op == "AND":
-                return db_collection.get_sound_by_and_tags(tags, oneshot, key,  limit, offset, rand)
+                rows = db_collection.get_sound_by_and_tags(tags, oneshot, key,  limit, offset, rand, fields=fields)
             else:
-                return db_collection.get_sound_by_or_tags(tags, oneshot, key, limit, offset, rand)
+                rows = db_collection.get_sound_by_or_tags(tags, oneshot, key, limit, offset, rand, fields=fields)
+        return to_columnar(rows) if layout == "columnar" else rows
+
+
+def _payload_paths():
+    """兼容单个 path 和批量 paths"""
+    payload = request.json
+    paths = payload.get("paths") or [payload.get("path", "")]
+    return [p.strip("/") for p in paths if p.strip("/")]
 
 
 @api.route("/collection/add")
 class CollectionAdd(Resource):
     def post(self):
-        path = request.json.get('path', "").strip("/")
-        uid = hashlib.md5(path.encode("utf-8")).hexdigest()
-        info = db_sound.get_sound_by_uid(uid)
-        if info:
-            db_collection.batch_insert(info)
+        # 元数据走 db_sound 的缓存，整批一次写入
+        rows = db_sound.get_sound_by_paths(_payload_paths())
+        if rows:
+            db_collection.batch_insert(rows)
         return {}
-        
 
-    
+
 @api.route("/collection/remove")
 class CollectionRemove(Resource):
     def post(self):
-        path = request.json.get('path', "").strip("/")
-        uid = hashlib.md5(path.encode("utf-8")).hexdigest()
-        db_collection.del_by_uid(uid)
+        uids = [hashlib.md5(p.encode("utf-8")).hexdigest() for p in _payload_paths()]
+        if uids:
+            db_collection.del_by_uids(uids)
         return {}
@@ -1,10 +1,25 @@
-import hashlib
 import mimetypes
+import time
 from flask_restx import Resource
 from flask import request, Response
 from extensions.ext_opendal import storage
 from extensions.ext_restx import api
 from extensions.ext_duck import db_sound
+from core.metrics import metrics
+
+
+def _measured_stream(gen, ext):
+    """统计实际传出的字节数和整个流的耗时"""
+    start = time.perf_counter()
+    sent = 0
+    try:
+        for chunk in gen:
+            sent += len(chunk)
+            yield chunk
+    finally:
+        metrics.inc("catchsound_file_bytes_total", sent, ext=ext)
+        metrics.inc("catchsound_file_streams_total", ext=ext)
+        metrics.observe("catchsound_file_stream_seconds", time.perf_counter() - start, ext=ext)
 
 
 @api.route("/file")
@@ -13,11 +28,15 @@ class FilePreview(Resource):
     def get(self):
         path = request.args.get("path", "").strip("/")
         if path:
-            uid = hashlib.md5(path.encode("utf-8")).hexdigest()
-            info = db_sound.get_sound_by_uid(uid)
+            info = db_sound.get_sound_by_path(path)
             if info:
                 info = info[0]
-                gen = storage.load_stream(path)
                 mime_type = mimetypes.guess_type(f"file{info['ext']}")[0]
+                accel = storage.accel_path(path)
+                if accel:
+                    # 字节由 nginx 发送，这里只统计次数
+                    metrics.inc("catchsound_file_redirects_total", ext=info["ext"])
+                    return Response(mimetype=mime_type, headers={"X-Accel-Redirect": accel})
+                gen = _measured_stream(storage.load_stream(path), info["ext"])
                 return Response(gen, mimetype=mime_type)
         return {}
@@ -0,0 +1,11 @@
+from flask import Response
+from flask_restx import Resource
+from extensions.ext_restx import api
+from core.metrics import metrics
+
+
+@api.route("/metrics")
+class Metrics(Resource):
+
+    def get(self):
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
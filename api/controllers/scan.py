@@ -0,0 +1,13 @@
+import os
+from flask_restx import Resource
+from extensions.ext_restx import api
+from config import DATA_DIR
+from core.scan_stats import ScanStats
+
+
+@api.route("/scan/status")
+class ScanStatus(Resource):
+
+    def get(self):
+        # 扫描跑在 flask rescan 进程里，这里只读它定期落盘的状态
+        return ScanStats.load(os.path.join(DATA_DIR, "scan_status.json"))
@@ -1,8 +1,10 @@
-import hashlib
 from flask_restx import Resource
 from extensions.ext_restx import api
 from flask import request
-from extensions.ext_duck import db_sound
+from config import BATCH_LOOKUP_LIMIT
+from extensions.ext_duck import db_sound, project_rows
+from core.encoding import to_columnar
+from core.similar import similar_index
 
 
 @api.route("/sounds")
@@ -18,11 +20,66 @@ class SoundList(Resource):
         key=payload.get("key", "")
         op = payload.get("op", "AND")
         rand = payload.get("rand", False)
+        collapse = payload.get("collapse", False)
+        # fields 只查需要的列；layout=columnar 按列返回并共用标签表
+        fields = payload.get("fields")
+        layout = payload.get("layout", "")
         if path:
-            uid = hashlib.md5(path.encode("utf-8")).hexdigest()
-            return db_sound.get_sound_by_uid(uid)
+            rows = project_rows(db_sound.get_sound_by_path(path), fields)
         else:
             if op == "AND":
-                return db_sound.get_sound_by_and_tags(tags, oneshot, key,  limit, offset, rand)
+                rows = db_sound.get_sound_by_and_tags(tags, oneshot, key,  limit, offset, rand, collapse, fields)
             else:
-                return db_sound.get_sound_by_or_tags(tags, oneshot, key, limit, offset, rand)
+                rows = db_sound.get_sound_by_or_tags(tags, oneshot, key, limit, offset, rand, collapse, fields)
+        return to_columnar(rows) if layout == "columnar" else rows
+
+
+@api.route("/sounds/batch")
+class SoundBatch(Resource):
+
+    def post(self):
+        """
+        一次解析一批路径或 uid（二选一，最多 BATCH_LOOKUP_LIMIT 个，超过返回 400），每个分片一条 IN 查询，
+        顺带把结果预热进元数据缓存，之后逐个试听不再查库；找不到的直接略过
+        """
+        payload = request.json
+        paths = payload.get("paths", [])
+        uids = payload.get("uids", [])
+        fields = payload.get("fields")
+        layout = payload.get("layout", "")
+        if paths and uids:
+            api.abort(400, "send either paths or uids, not both")
+        if len(paths) > BATCH_LOOKUP_LIMIT or len(uids) > BATCH_LOOKUP_LIMIT:
+            api.abort(400, f"at most {BATCH_LOOKUP_LIMIT} paths or uids per request")
+        if paths:
+            rows = db_sound.get_sound_by_paths([p.strip("/") for p in paths])
+        else:
+            rows = db_sound.get_sound_by_uids(uids)
+        rows = project_rows(rows, fields)
+        return to_columnar(rows) if layout == "columnar" else rows
+
+
+@api.route("/sounds/similar")
+class SoundSimilar(Resource):
+
+    def get(self):
+        uid = request.args.get("uid", "")
+        limit = request.args.get("limit", 50, type=int)
+        if not uid:
+            return []
+        neighbours = similar_index.search(uid, limit)
+        scores = dict(neighbours)
+        rows = db_sound.get_sound_by_uids([x[0] for x in neighbours])
+        for row in rows:
+            row["score"] = scores[row["uid"]]
+        return rows
+
+
+@api.route("/sounds/duplicates")
+class SoundDuplicates(Resource):
+
+    def get(self):
+        uid = request.args.get("uid", "")
+        if not uid:
+            return []
+        return db_sound.get_duplicates_by_uid(uid)
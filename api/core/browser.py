@@ -1,21 +1,34 @@
 import os
-from config import OPENDAL_FS_ROOT
+from core.library import library
+from extensions.ext_opendal import storage
 
 class Browser:
     
-    ROOT = OPENDAL_FS_ROOT
-    
     @classmethod
     def _safe(cls, path):
-        full = os.path.abspath(os.path.join(cls.ROOT, path.lstrip('/')))
-        if not full.startswith(os.path.abspath(cls.ROOT)):
+        name, rel = library.resolve(path)
+        if name is None:
+            raise Exception("path error.")
+        root = os.path.abspath(library.roots[name])
+        full = os.path.abspath(os.path.join(root, rel))
+        if full != root and not full.startswith(root + os.sep):
             raise Exception("path error.")
         return full
 
+    @classmethod
+    def _roots(cls):
+        """多根时顶层是各个库根，不去 stat 根目录，离线的 NAS 不会卡住浏览；离线状态用存储层上次检查的结果"""
+        return [
+            {"name": name, "path": name, "type": 'folder', "subs": None, "offline": name in storage.offline}
+            for name in sorted(library.roots)
+        ]
+
     @classmethod
     def contents(cls, path):
+        if library.multi and not path.strip("/"):
+            return cls._roots()
         full = cls._safe(path)
-        if not os.path.isdir(full):
+        if not storage.online(library.resolve(path)[0]) or not os.path.isdir(full):
             return []
         items = []
         for name in sorted(os.listdir(full)):
@@ -58,3 +71,48 @@ class Browser:
             return contents
         
         return build_tree("")
+
+
+class AsyncBrowser(Browser):
+    """
+    Browser 的异步版本，走 OpenDAL AsyncOperator，供 asgi 模式使用
+    """
+
+    @classmethod
+    async def contents(cls, path):
+        if library.multi and not path.strip("/"):
+            return cls._roots()
+        cls._safe(path)
+        if not storage.online(library.resolve(path)[0]):
+            return []
+        prefix = path.strip("/") + "/" if path.strip("/") else ""
+        items = []
+        for entry in await storage.alist(prefix or "/"):
+            entry = entry.lstrip("/")
+            if not entry or entry.rstrip("/") == prefix.rstrip("/"):
+                continue
+            name = entry.rstrip("/").rsplit("/", 1)[-1]
+            items.append({
+                "name": name,
+                "path": os.path.join(path, name).replace('\\', '/'),
+                "type": 'folder' if entry.endswith("/") else 'file',
+                "subs": None,
+            })
+        return sorted(items, key=lambda item: item["name"])
+
+    @classmethod
+    async def branch(cls, filepath):
+        cls._safe(filepath)
+
+        if not await storage.ais_file(filepath):
+            raise Exception("branch函数只支持文件路径")
+
+        async def build_tree(path):
+            contents = await cls.contents(path)
+            for item in contents:
+                item["is_current_file"] = (item["path"] == filepath)
+                if item["type"] == "folder" and filepath.startswith(item["path"] + '/'):
+                    item["subs"] = await build_tree(item["path"])
+            return contents
+
+        return await build_tree("")
@@ -0,0 +1,35 @@
+import msgpack
+from flask import make_response
+
+MSGPACK_MIMETYPE = "application/x-msgpack"
+
+
+def to_columnar(rows):
+    """
+    行列表转成按列存放的紧凑形式，tags 换成公共标签表里的下标：
+    {"count": 2, "columns": {"uid": [...], "tags": [[0, 1], [1]]}, "tag_dict": ["kick", "wav"]}
+    """
+    names = list(rows[0].keys()) if rows else []
+    columns = {name: [row[name] for row in rows] for name in names}
+    tag_dict = []
+    if "tags" in columns:
+        positions = {}
+        encoded = []
+        for tags in columns["tags"]:
+            ids = []
+            for tag in tags or []:
+                if tag not in positions:
+                    positions[tag] = len(tag_dict)
+                    tag_dict.append(tag)
+                ids.append(positions[tag])
+            encoded.append(ids)
+        columns["tags"] = encoded
+    return {"count": len(rows), "columns": columns, "tag_dict": tag_dict}
+
+
+def output_msgpack(data, code, headers=None):
+    """flask-restx 的 representation：请求头 Accept: application/x-msgpack 时用 MessagePack 编码"""
+    resp = make_response(msgpack.packb(data, use_bin_type=True), code)
+    resp.headers.extend(headers or {})
+    resp.headers["Content-Type"] = MSGPACK_MIMETYPE
+    return resp
@@ -0,0 +1,97 @@
+import numpy as np
+
+
+class FeatureExtractor:
+    """
+    紧凑的音频特征向量：MFCC 均值/标准差 + 若干频谱统计量，用于相似声音检索
+    """
+
+    def __init__(self, n_fft=2048, hop=1024, n_mels=40, n_mfcc=13, max_seconds=10):
+        self.n_fft = n_fft
+        self.hop = hop
+        self.n_mels = n_mels
+        self.n_mfcc = n_mfcc
+        self.max_seconds = max_seconds
+        self.dim = n_mfcc * 2 + 6
+        self.window = np.hanning(n_fft).astype(np.float32)
+        self.dct = self._dct_matrix(n_mfcc, n_mels)
+        self.mel_cache = {}
+
+    def extract(self, file_path):
+        """返回 float32 特征列表，无法解码的文件返回 None"""
+        # 只有扫描用得到 libsndfile，延迟到这里 import，API 进程启动时不加载
+        import soundfile as sf
+        try:
+            with sf.SoundFile(str(file_path)) as f:
+                samplerate = f.samplerate
+                data = f.read(int(samplerate * self.max_seconds), dtype="float32", always_2d=True)
+        except Exception:
+            return None
+        if data.size == 0:
+            return None
+
+        mono = data.mean(axis=1)
+        if len(mono) < self.n_fft:
+            mono = np.pad(mono, (0, self.n_fft - len(mono)))
+        frames = np.lib.stride_tricks.sliding_window_view(mono, self.n_fft)[::self.hop]
+
+        spec = np.abs(np.fft.rfft(frames * self.window, axis=1)) + 1e-10
+        power = spec ** 2
+        freqs = np.fft.rfftfreq(self.n_fft, 1.0 / samplerate) / (samplerate / 2)
+
+        mel = np.log(power @ self._mel_filters(samplerate).T + 1e-10)
+        mfcc = mel @ self.dct.T
+
+        spec_sum = spec.sum(axis=1)
+        centroid = (spec * freqs).sum(axis=1) / spec_sum
+        bandwidth = np.sqrt((spec * (freqs[None, :] - centroid[:, None]) ** 2).sum(axis=1) / spec_sum)
+        cumsum = np.cumsum(spec, axis=1)
+        rolloff = freqs[np.argmax(cumsum >= 0.85 * cumsum[:, -1:], axis=1)]
+        flatness = np.exp(np.log(power).mean(axis=1)) / power.mean(axis=1)
+        rms = np.log(np.sqrt((frames ** 2).mean(axis=1)) + 1e-10)
+        zcr = (np.diff(np.signbit(frames), axis=1) != 0).mean(axis=1)
+
+        vector = np.concatenate([
+            mfcc.mean(axis=0),
+            mfcc.std(axis=0),
+            [centroid.mean(), bandwidth.mean(), rolloff.mean(), flatness.mean(), rms.mean(), zcr.mean()],
+        ]).astype(np.float32)
+        if not np.all(np.isfinite(vector)):
+            return None
+        return vector.tolist()
+
+    def _mel_filters(self, samplerate):
+        """三角 mel 滤波器组，按采样率缓存"""
+        if samplerate in self.mel_cache:
+            return self.mel_cache[samplerate]
+
+        def hz_to_mel(hz):
+            return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+        def mel_to_hz(mel):
+            return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+        n_bins = self.n_fft // 2 + 1
+        mel_points = np.linspace(hz_to_mel(0), hz_to_mel(samplerate / 2), self.n_mels + 2)
+        bins = np.floor((self.n_fft + 1) * mel_to_hz(mel_points) / samplerate).astype(int)
+        filters = np.zeros((self.n_mels, n_bins), dtype=np.float32)
+        for i in range(1, self.n_mels + 1):
+            left, center, right = bins[i - 1], bins[i], bins[i + 1]
+            if center > left:
+                filters[i - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+            if right > center:
+                filters[i - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+        self.mel_cache[samplerate] = filters
+        return filters
+
+    @staticmethod
+    def _dct_matrix(n_out, n_in):
+        """DCT-II (ortho) 变换矩阵"""
+        n = np.arange(n_in)
+        k = np.arange(n_out)[:, None]
+        dct = np.cos(np.pi / n_in * (n + 0.5) * k) * np.sqrt(2.0 / n_in)
+        dct[0] /= np.sqrt(2.0)
+        return dct.astype(np.float32)
+
+
+feature_extractor = FeatureExtractor()
@@ -0,0 +1,37 @@
+from config import LIBRARY_ROOTS
+
+
+class Library:
+    """
+    采样库根目录的命名空间：单根时路径就是相对根目录的路径（与旧版一致），
+    多根时第一段是根名，例如 nas/Drums/kick.wav
+    """
+
+    def __init__(self, roots):
+        self.roots = dict(roots)
+        self.multi = len(self.roots) > 1
+        self.default = next(iter(self.roots))
+
+    def resolve(self, path):
+        """库路径 -> (根名, 根内相对路径)，根不存在时返回 (None, None)"""
+        path = path.lstrip("/")
+        if not self.multi:
+            return self.default, path
+        name, _, rel = path.partition("/")
+        if name not in self.roots:
+            return None, None
+        return name, rel
+
+    def join(self, name, rel):
+        """(根名, 根内相对路径) -> 库路径"""
+        rel = rel.lstrip("/")
+        if not self.multi:
+            return rel
+        return f"{name}/{rel}" if rel else name
+
+    def db_name(self, name):
+        # 单根沿用 sound.duck，老库不用迁移
+        return "sound.duck" if not self.multi else f"sound.{name}.duck"
+
+
+library = Library(LIBRARY_ROOTS)
@@ -0,0 +1,70 @@
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class SamplingProfiler:
+    """
+    采样式 profiler：后台线程定期抓取所有线程的调用栈，覆盖扫描的工作线程
+    （cProfile 只能跟踪单个线程，3.12 起也不能在多个线程同时开启）
+    """
+
+    def __init__(self, interval=0.005, max_depth=64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.stacks.clear()
+        self.samples = 0
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while self.running:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+
+    def dump(self, path_prefix, top=50):
+        """
+        {path_prefix}.folded: 折叠栈，可直接喂给 flamegraph.pl / speedscope
+        {path_prefix}.txt: 按 self / 累计采样数排序的热点函数
+        """
+        self_counts = Counter()
+        total_counts = Counter()
+        with open(f"{path_prefix}.folded", "w") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {n}\n")
+                self_counts[stack[-1]] += n
+                for func in set(stack):
+                    total_counts[func] += n
+
+        total = sum(self.stacks.values()) or 1
+        with open(f"{path_prefix}.txt", "w") as f:
+            f.write(f"samples: {self.samples}, interval: {self.interval}s, thread stacks: {total}\n\n")
+            for title, counts in [("self", self_counts), ("cumulative", total_counts)]:
+                f.write(f"== top {top} by {title} ==\n")
+                for func, n in counts.most_common(top):
+                    f.write(f"{n:>8} {n * 100.0 / total:6.2f}%  {func}\n")
+                f.write("\n")
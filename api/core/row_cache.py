@@ -0,0 +1,52 @@
+import threading
+from collections import OrderedDict
+from core.metrics import metrics
+
+
+class RowCache:
+    """
+    uid -> 整行元数据的进程内 LRU 缓存，连续试听同一批采样时不用每次都查 DuckDB；
+    generation 在清空时加一，清空前发出的查询结果不会再被写回缓存
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.rows = OrderedDict()
+        self.generation = 0
+
+    def get_many(self, uids):
+        """返回 (命中的 {uid: row}, 未命中的 uid 列表)"""
+        found, missing = {}, []
+        with self.lock:
+            for uid in uids:
+                row = self.rows.get(uid)
+                if row is None:
+                    missing.append(uid)
+                else:
+                    self.rows.move_to_end(uid)
+                    found[uid] = row
+        if found:
+            metrics.inc("catchsound_row_cache_total", len(found), result="hit")
+        if missing:
+            metrics.inc("catchsound_row_cache_total", len(missing), result="miss")
+        return found, missing
+
+    def put_many(self, rows, generation):
+        with self.lock:
+            if generation != self.generation:
+                return
+            for row in rows:
+                self.rows[row["uid"]] = row
+                self.rows.move_to_end(row["uid"])
+            while len(self.rows) > self.maxsize:
+                self.rows.popitem(last=False)
+
+    def discard(self, uid):
+        with self.lock:
+            self.rows.pop(uid, None)
+
+    def clear(self):
+        with self.lock:
+            self.rows.clear()
+            self.generation += 1
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from core.metrics import Histogram
+
+
+class ScanStats:
+    """
+    扫描过程的计数器和各阶段耗时，定期落盘为 json 供 API 进程读取进度
+    """
+
+    def __init__(self, status_path, dump_interval=1.0):
+        self.status_path = status_path
+        self.dump_interval = dump_interval
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.state = "idle"
+            self.started_at = None
+            self.finished_at = None
+            self.walking = False
+            self.discovered = 0
+            self.processed = 0
+            self.failed = 0
+            self.counters = defaultdict(int)
+            self.failures = defaultdict(int)
+            # 各库根的状态：scanning / done / offline / failed，和文件级的失败数分开
+            self.roots = {}
+            self.stages = defaultdict(Histogram)
+            self.last_dump = 0.0
+
+    def start(self):
+        self.reset()
+        self.state = "running"
+        self.walking = True
+        self.started_at = time.time()
+        self.dump(force=True)
+
+    def finish(self, state="finished"):
+        self.state = state
+        self.walking = False
+        self.finished_at = time.time()
+        self.dump(force=True)
+
+    def discover(self):
+        with self.lock:
+            self.discovered += 1
+
+    def done(self):
+        with self.lock:
+            self.processed += 1
+
+    def fail(self, reason):
+        with self.lock:
+            self.failed += 1
+            self.failures[reason] += 1
+
+    def root(self, name, state):
+        with self.lock:
+            self.roots[name] = state
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] += n
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            hist = self.stages[stage]
+        hist.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def snapshot(self):
+        with self.lock:
+            now = self.finished_at or time.time()
+            elapsed = now - self.started_at if self.started_at else 0.0
+            finished = self.processed + self.failed
+            rate = finished / elapsed if elapsed > 0 else 0.0
+            eta = None
+            if self.state == "running" and not self.walking and rate > 0:
+                eta = round((self.discovered - finished) / rate, 1)
+            return {
+                "state": self.state,
+                "walking": self.walking,
+                "started_at": self.started_at,
+                "updated_at": time.time(),
+                "elapsed": round(elapsed, 3),
+                "discovered": self.discovered,
+                "processed": self.processed,
+                "failed": self.failed,
+                "files_per_sec": round(rate, 2),
+                "eta": eta,
+                "counters": dict(self.counters),
+                "failures": dict(self.failures),
+                "roots": dict(self.roots),
+                "stages": {k: v.snapshot() for k, v in sorted(self.stages.items())},
+            }
+
+    def dump(self, force=False):
+        """节流写入状态文件，返回是否真的写了"""
+        now = time.time()
+        if not force and now - self.last_dump < self.dump_interval:
+            return False
+        self.last_dump = now
+        tmp_path = self.status_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False)
+        os.replace(tmp_path, self.status_path)
+        return True
+
+    @staticmethod
+    def load(status_path):
+        if not os.path.exists(status_path):
+            return {"state": "idle"}
+        with open(status_path) as f:
+            return json.load(f)
@@ -1,14 +1,22 @@
 import hashlib
+import os
+import queue
 import time
 import re
-import jieba
-import spacy
+import threading
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import numpy as np
 from mutagen import File
 from tinytag import TinyTag
 from readerwriterlock import rwlock
+from core.feature import feature_extractor
+from core.library import library
+from core.profiler import SamplingProfiler
+from core.scan_stats import ScanStats
+from core.tags import NICE_TAGS
+from config import DATA_DIR, SCAN_VERIFY_HASH
 
 
 class SoundScanner:
@@ -18,6 +26,10 @@ class SoundScanner:
             "duration", "channels", "bitrate", "bitdepth",
             "samplerate", "bpm", "year", "key", "oneshot",
         ]
+        # 内容相同的文件可以直接复用的元数据
+        self.info_reusable = [
+            "duration", "channels", "bitrate", "bitdepth", "samplerate", "bpm", "year",
+        ]
         self.exts_required = [
             '.mp3', '.wav', '.flac', '.aiff', '.m4a', '.ogg', '.tta', '.ape', 
             '.mpc', '.mpp', '.wv', '.wma', '.wmv', '.aif', '.mid', '.midi'
@@ -70,235 +82,320 @@ class SoundScanner:
             'MINNor', 'MINNoR', 'MINNOr', 'MINNOR',
             'MINnor', 'MINnoR', 'MINnOr', 'MINnOR',
         ]
-        self.major_chords = set()
-        for r in self.notes:
-            for m in self.mid_in_chord:
-                for s in self.maj_suffix:
-                    name = r+m+s
-                    if name.strip(''.join(self.mid_in_chord)) == name:
-                        self.major_chords.add(name)
-        
-        self.minor_chords = set()
-        for r in self.notes:
-            for m in self.mid_in_chord:
-                for s in self.min_suffix:
-                    name = r+m+s
-                    if name.strip(''.join(self.mid_in_chord)) == name:
-                        self.minor_chords.add(name)
-        self.all_chords = self.major_chords | self.minor_chords
-        self.nice_tags = set([
-            # 乐器类别
-            # 键盘乐器
-            "piano", "pianos", "electric", "organ", "organs", "harpsichord", "harpsichords", "clavinet", "clavinets",
-            "synthesizer", "synthesizers", "synth", "synths", "keyboard", "keyboards", "accordion", "accordions", 
-            "melodica", "melodicas", "rhodes", "wurlitzer", "celesta", "celestas", "keytar", "keytars",
-            # 弦乐器
-            "acoustic", "guitar", "guitars", "bass", "basses", "classical", "steel", 
-            "twelve", "string", "strings", "ukulele", "ukuleles", "uke", "ukes", "resonator", "resonators", "lap",
-            "nylon", "pedal", "pedals", "baritone", "baritones", "fretless", "violin", "violins", "viola", "violas", 
-            "cello", "cellos", "double", "harp", "harps", "fiddle", "fiddles", "bow", "bows", "bowed", "pizzicato",
-            # 打击乐器
-            "drum", "drums", "kit", "kits", "snare", "snares", "tom", "toms", "floor", "cymbal", "cymbals", 
-            "hi", "hat", "hats", "ride", "rides", "crash", "crashes", "splash", "splashes", "china",
-            "kick", "kicks", "percussion", "beat", "beats", "conga", "congas", "bongo", "bongos", "djembe", "djembes", 
-            "tambourine", "tambourines", "maracas", "cowbell", "cowbells", "triangle", "triangles", "xylophone", "xylophones", 
-            "vibraphone", "vibraphones", "glockenspiel", "glockenspiels", "timpani", "bell", "bells", "chime", "chimes", 
-            "woodblock", "woodblocks", "clap", "claps", "shaker", "shakers", "cabasa", "cabasas", "timbale", "timbales",
-            # 管乐器
-            "flute", "flutes", "piccolo", "piccolos", "clarinet", "clarinets", "saxophone", "saxophones", "sax", "saxes", 
-            "oboe", "oboes", "bassoon", "bassoons", "recorder", "recorders", "harmonica", "harmonicas", "pan", "pans", 
-            "pipe", "pipes", "ocarina", "ocarinas", "trumpet", "trumpets", "trombone", "trombones", "french", "horn", "horns", 
-            "tuba", "tubas", "cornet", "cornets", "flugelhorn", "flugelhorns", "bugle", "bugles", "euphonium", "euphoniums", 
-            "woodwind", "woodwinds", "brass",
-            # 电子乐器
-            "machine", "machines", "sampler", "samplers", "sequencer", "sequencers", "theremin", "theremins", "midi", 
-            "controller", "controllers", "turntable", "turntables", "modular", "groove", "workstation", "workstations",
-            "vocoder", "vocoders", "808", "analog", "digital",
-            # 民族乐器
-            "erhu", "pipa", "guzheng", "dizi", "suona", "yangqin",
-            "guqin", "liuqin", "ruan", "hulusi", "sheng", "sitar", "sitars",
-            "tabla", "koto", "kotos", "shamisen", "bagpipes", "banjo", "banjos", 
-            "mandolin", "mandolins", "bouzouki", "bouzoukis", "balalaika", "balalaikas", "kalimba", "kalimbas", "didgeridoo", "didgeridoos",
-            # 音乐风格
-            # 电子音乐
-            "electronic", "edm", "techno", "house", "trance", "dubstep",
-            "drum", "drums", "bass", "basses", "dnb", "trap", "dub", "ambient", "downtempo",
-            "chillout", "chillwave", "glitch", "glitches", "idm", "lo-fi", "chiptune",
-            "acid", "breakbeat", "breakbeats", "jungle", "jungles", "hardstyle", "psytrance",
-            "electro", "minimal", "deep", "tech", "progressive",
-            "eurodance", "leftfield", "experimental", "tearout",
-            "fidget", "industrial", "moombahton", "synthwave",
-            "retrowave", "vaporwave", "phonk", "hyperpop",
-            # 流行音乐
-            "pop", "rock", "indie", "alternative", "punk", "metal", "metals",
-            "hardcore", "emo", "screamo", "post", "math", "prog",
-            "jazz", "blues", "r&b", "soul", "funk", "disco",
-            "reggae", "dancehall", "hip", "hop", "rap", "grime",
-            "drill", "pluggnb", "amapiano", "afrobeat", "afropop",
-            "afrobeats", "bossa", "nova", "samba", "sambas", "cumbia", "salsa", 
-            "reggaeton", "flamenco", "gospel", "country", "folk",
-            "bluegrass", "americana",
-            # 世界音乐
-            "latin", "caribbean", "brazilian", "african", "indian", "indians",
-            "asian", "asians", "eastern", "oriental", "middle", "global", "world",
-            # 地区风格
-            "kpop", "jpop", "cpop", "uk", "american", "french",
-            "jersey", "south", "chinese", "japanese", "korean",
-            # 影视游戏音乐
-            "cinematic", "orchestral", "classical", "game", "games", "video", "videos",
-            "movie", "movies", "film", "films", "trailer", "trailers", "score", "scores", "soundtrack", "soundtracks",
-            # 声音效果和特性
-            "riser", "risers", "impact", "impacts", "sweep", "sweeps", "noise", "noises", "fx", "atmosphere", "atmospheres", 
-            "texture", "textures", "reverse", "stutter", "stutters", "granular", "distorted", 
-            "clean", "field", "fields", "recording", "recordings", "live", "vintage", "modern", 
-            "retro",
-            # 演奏技巧和音乐元素
-            "melody", "melodies", "harmony", "harmonies", "rhythm", "rhythms", "groove", "grooves", "chord", "chords", "arp", 
-            "arpeggio", "arpeggios", "riff", "riffs", "fill", "fills", "break", "breaks", "phrase", "phrases", "stab", "stabs", 
-            "pluck", "plucks", "lead", "leads", "pad", "pads", "bassline", "basslines", "vocal", "vocals", "choir", "choirs", 
-            "ensemble", "ensembles", "solo", "solos", "layer", "layers",
-            # 音色描述
-            "bright", "dark", "warm", "cold", "soft", "hard", "smooth", 
-            "rough", "punchy", "harsh", "crisp", "muddy", "fat", "thin", 
-            "rich", "full", "empty", "deep", "shallow", "wide", "narrow", 
-            "thick", "epic", "huge", "large", "small", "fuzz", "tube", "tubes",
-            "over", "drive", "drives",
-            # 演奏技法
-            "sustain", "sustains", "decay", "decays", "attack", "attacks", "release", "releases", "vibrato", "vibratos", "tremolo", "tremolos",
-            "legato", "staccato", "mute", "mutes", "harmonics", "slide", "slides", "bend", "bends",
-            # 人声类型
-            "voice", "voices", "male", "males", "female", "females", "spoken", "whisper", "whispers", "shout", "shouts", 
-            "scream", "screams", "dialogue", "dialogues",
-            # 鼓组元素
-            "sn", "sns", "snr", "snrs", "hh", "hhs", "cym", "cyms", "rim", "rims", "kik", "kiks",
-            # 合成器类型
-            "saw", "saws", "pulse", "pulses", "sine", "sines", "square", "squares", "wobble", "wobbles", "sub", "subs",
-            # 音乐特性
-            "fast", "slow", "up", "down", "big", "high", "low", "heavy", 
-            "light",
-            # 情感氛围
-            "happy", "sad", "angry", "calm", "tense", "emotional",
-            "mysterious", "magical", "dreamy", "ethereal", "space", "spaces",
-            "underwater", "forest", "forests", "urban", "industrial", "natural",
-            "mechanical", "organic", "synthetic", "futuristic", "ancient",
-            # 技术术语
-            "bpm", "db", "eq", "lfo", "vca", "vcf", "vco", "adsr",
-            "daw", "vst", "au", "aax", "osc", "oscs", "env", "envs", "comp", "comps", "limiter", "limiters", 
-            "gate", "gates", "sidechain", "sidechains", "wet", "dry", "mono", "stereo", "hq", 
-            "lq", "hd", "sd", "fi",
-            # 制作相关
-            "recorded", "sampled", "synthesized", "processed", "raw",
-            "effected", "filtered", "compressed", "limited", "saturated", 
-            "overdriven", "bitcrushed", "resampled",
-            # 特殊效果
-            "chopped", "sliced", "stretched", "pitched", "transposed", 
-            "harmonized", "stacked", "mixed", "blended", "isolated",
-            # 场景用途
-            "bedroom", "bedrooms", "rave", "raves", "festival", "festivals", "party", "parties", "dance", "dances", "chill", 
-            "study", "sleep", "focus", "workout", "workouts", "gym", "gyms",
-            # 音效
-            "sfx", "biu", "knock", "knocks", "hit", "hits", "snap", "snaps",
-            # 音频文件格式
-            "mp3", "wav", "mid", "midi", "aiff", "aif", "flac", "m4a", 
-            "wma", "ogg", "opus", "aac", "dsd", "mp4", "wavpack", "ape",
-            # 其他
-            "instrument", "instruments", "color", "colors", "hype", "blue", "sick", "amb", "vibe", "vibes", 
-            "kk", "cp", "roll", "rolls", "slice", "slices", "pattern", "patterns", "word", "words", "speed", "speeds", "rage",
-            "phase", "phases", "grand", "8bit", "art", "arts", "stin", "vox", "cymbol", "cymbols"
-        ])
+        self.nice_tags = NICE_TAGS
+        # 和弦表、spaCy、jieba 都很重，第一次分词时才加载，见 _load_models
+        self.major_chords = None
+        self.minor_chords = None
+        self.all_chords = None
+        self.en_cut = None
+        self.jieba = None
+        self.models_lock = threading.Lock()
 
-        self.en_cut = spacy.blank("en")
-        for word in self.all_chords | self.nice_tags:
-            self.en_cut.tokenizer.add_special_case(word, [{"ORTH": word}])
-        
         self.loop_words = set(["loops", "loop", "loop", 'lxxp', 'loopz', 'lxxxp', 'lxxps','lxxxps'])
         self.shot_words = set(["one", "shot", "shots", "shxts", "shxt", "shotz", "shxtz"])
         self.batch_size = 10000
         self.cut_cache = {}
         self.rwlock =  rwlock.RWLockWrite()
+        self.hash_block = 64 * 1024
+        self.verify_hash = SCAN_VERIFY_HASH
+        # 本次扫到的 content_hash -> (abs_path, 可复用元数据, float32 特征字节)，每条只占几百字节
+        self.content_cache = {}
+        # 已入库的 content_hash -> uid，命中时再用 reuse(uid) 从 DuckDB 取回元数据和特征
+        self.known = {}
+        self.reuse = None
+        self.full_hashes = {}
+        self.stats = ScanStats(os.path.join(DATA_DIR, "scan_status.json"))
+        self.profile = False
+        self.profiler = SamplingProfiler()
 
-    def scan(self, root_path: str):
-        
-        root_path = Path(root_path)
+    def _load_models(self):
+        if self.en_cut is not None:
+            return
+        with self.models_lock:
+            if self.en_cut is not None:
+                return
+            import jieba
+            import spacy
+
+            major_chords = set()
+            for r in self.notes:
+                for m in self.mid_in_chord:
+                    for s in self.maj_suffix:
+                        name = r+m+s
+                        if name.strip(''.join(self.mid_in_chord)) == name:
+                            major_chords.add(name)
+
+            minor_chords = set()
+            for r in self.notes:
+                for m in self.mid_in_chord:
+                    for s in self.min_suffix:
+                        name = r+m+s
+                        if name.strip(''.join(self.mid_in_chord)) == name:
+                            minor_chords.add(name)
+
+            en_cut = spacy.blank("en")
+            for word in major_chords | minor_chords | self.nice_tags:
+                en_cut.tokenizer.add_special_case(word, [{"ORTH": word}])
+
+            self.major_chords = major_chords
+            self.minor_chords = minor_chords
+            self.all_chords = major_chords | minor_chords
+            self.jieba = jieba
+            # en_cut 最后赋值，其他线程看到它非空时其余表已经就绪
+            self.en_cut = en_cut
+
+    def scan(self, roots: dict, known: dict = None, reuse=None):
+        """
+        roots: 库根名 -> 目录，各个根各用一个线程遍历，慢的或离线的根不会挡住其他根
+        known: 已入库的 content_hash -> uid，命中的重复文件只需计算一次指纹，
+        reuse(uid) 从库里取回 {"abs_path", "info", "feature"}，取不到时按新文件解析
+        逐个产出 (根名, 行)；某个根全部处理完时产出 (根名, None)，调用方可以先把这个根落库，
+        遍历出错（比如 NAS 掉线）的根不会产出这个结束标记
+        """
+        self.content_cache = {}
+        self.known = known or {}
+        self.reuse = reuse
+        self.full_hashes = {}
        
-        print(f"🚀 开始并行扫描...")
+        print(f"🚀 开始并行扫描 {', '.join(roots)} ...")
         start_time = time.time()
+        self.stats.start()
+        if self.profile:
+            self.profiler.start()
+
+        results = queue.Queue()
+        submitted = {name: 0 for name in roots}
+        consumed = {name: 0 for name in roots}
+        walking = set(roots)
+        broken = set()
+        state = "failed"
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                def walk(name, root_path):
+                    try:
+                        with self.stats.timer(f"walk.{name}"):
+                            # rglob 对不存在的目录静默返回空，没挂载的 NAS 要当成失败
+                            if not root_path.is_dir():
+                                raise NotADirectoryError(f"{root_path} is not a directory")
+                            for file_path in root_path.rglob('*'):
+                                if file_path.is_file() and file_path.name[0] != "." and file_path.suffix.lower() in self.exts_required:
+                                    self.stats.discover()
+                                    submitted[name] += 1
+                                    future = executor.submit(self._process_single_file, file_path, root_path, name)
+                                    future.add_done_callback(lambda f, name=name: results.put((name, f)))
+                    except OSError as e:
+                        broken.add(name)
+                        self.stats.root(name, "offline" if isinstance(e, NotADirectoryError) else "failed")
+                        print(f"⚠️ 遍历 {name} 失败 {root_path}: {e}")
+                    finally:
+                        results.put((name, None))
+
+                for name in roots:
+                    self.stats.root(name, "scanning")
+                walkers = [
+                    threading.Thread(target=walk, args=(name, Path(root)), daemon=True)
+                    for name, root in roots.items()
+                ]
+                for walker in walkers:
+                    walker.start()
+
+                while walking or sum(consumed.values()) < sum(submitted.values()):
+                    try:
+                        name, future = results.get(timeout=1)
+                    except queue.Empty:
+                        self._report_progress()
+                        continue
+                    if future is None:
+                        walking.discard(name)
+                        if not walking:
+                            self.stats.walking = False
+                    else:
+                        consumed[name] += 1
+                        row = future.result()
+                        self._report_progress()
+                        if row is not None:
+                            yield name, row
+                    if name not in walking and consumed[name] == submitted[name]:
+                        # 这个根已经遍历并处理完
+                        submitted[name] = consumed[name] = -1
+                        if name not in broken:
+                            self.stats.root(name, "done")
+                            yield name, None
+            state = "finished"
+        finally:
+            if self.profile:
+                self.profiler.stop()
+                self.profiler.dump(os.path.join(DATA_DIR, "scan_profile"))
+                print(f"🔥 profile 已写入 {os.path.join(DATA_DIR, 'scan_profile')}.txt/.folded")
+            self.stats.finish(state)
 
-        futures = []
-        counter = 0
-        
-        with ThreadPoolExecutor(max_workers=8) as executor:
-            for file_path in root_path.rglob('*'):
-                if file_path.is_file() and file_path.name[0] != "." and file_path.suffix.lower() in self.exts_required:
-                    counter += 1
-                    futures.append(executor.submit(self._process_single_file, file_path, root_path))
-            
-            for future in as_completed(futures):
-                row = future.result()
-                yield row
-        
         total_time = time.time() - start_time
-        print(f"🎉 扫描完成！处理 {counter} 个文件，耗时 {total_time:.2f} 秒")
-        
+        print(f"🎉 扫描完成！处理 {self.stats.processed} 个文件，失败 {self.stats.failed} 个，耗时 {total_time:.2f} 秒")
+        unfinished = {name: state for name, state in self.stats.roots.items() if state != "done"}
+        if unfinished:
+            print(f"⚠️ 未扫完的库根: {', '.join(f'{name}({state})' for name, state in unfinished.items())}")
+
+    def _report_progress(self):
+        if self.stats.dump():
+            snap = self.stats.snapshot()
+            eta = "-" if snap["eta"] is None else f"{snap['eta']:.0f}s"
+            print(f"📊 已发现 {snap['discovered']}，已处理 {snap['processed']}，失败 {snap['failed']}，"
+                  f"{snap['files_per_sec']:.1f} 个/秒，剩余 {eta}")
+
     
-    def _process_single_file(self, file_path: Path, root_path: Path):
-        print(f"✅ 文件路径: {str(file_path)}")
-        file_info = self._fetch_static_info(file_path, root_path)
-        file_info, tags = self._fetch_info_by_cut(file_path, root_path, file_info)
+    def _process_single_file(self, file_path: Path, root_path: Path, root_name: str):
+        start = time.perf_counter()
+        try:
+            infos = self._process_file(file_path, root_path, root_name)
+        except OSError as e:
+            self.stats.fail(f"io:{type(e).__name__}")
+            print(f"⚠️ 处理文件失败 {file_path}: {e}")
+            return None
+        except Exception as e:
+            self.stats.fail(f"error:{type(e).__name__}")
+            print(f"⚠️ 处理文件失败 {file_path}: {e}")
+            return None
+        self.stats.observe("file", time.perf_counter() - start)
+        self.stats.done()
+        return infos
+
+    def _process_file(self, file_path: Path, root_path: Path, root_name: str):
+        with self.stats.timer("fingerprint"):
+            content_hash = self._fingerprint(file_path)
+            cached, content_hash = self._reuse_content(content_hash, file_path)
+        if cached is not None:
+            self.stats.count("dedup_hit")
+            _, file_info, feature = self._unpack(cached)
+            file_info.update(self._fetch_path_info(file_path, root_path, root_name))
+        else:
+            with self.stats.timer(f"parse{file_path.suffix.lower()}"):
+                file_info = self._fetch_static_info(file_path, root_path, root_name)
+            with self.stats.timer("feature"):
+                feature = feature_extractor.extract(file_path)
+            if feature is None:
+                self.stats.count("feature_missing")
+            with self.rwlock.gen_wlock():
+                self.content_cache.setdefault(content_hash, self._pack(str(file_path), file_info, feature))
+        with self.stats.timer("tokenize"):
+            file_info, tags = self._fetch_info_by_cut(file_path, root_path, file_info)
         
         infos = {}
         for k in self.info_required:
             infos[k] = file_info.get(k, "")
         infos["tags"] = tags
-        print(f"🎉  文件路径: {str(file_path)}")
+        infos["feature"] = feature
+        infos["content_hash"] = content_hash
         return infos
     
-    def _fetch_static_info(self, file_path: Path, root_path: Path):
+    def _fingerprint(self, file_path: Path, full: bool = False):
+        """快速内容指纹：文件大小 + 头/中/尾三个采样块；full=True 时哈希整个文件"""
+        size = file_path.stat().st_size
+        h = hashlib.blake2b(str(size).encode("utf-8"), digest_size=16)
+        with open(file_path, "rb") as f:
+            if full or size <= self.hash_block * 3:
+                while chunk := f.read(1024 * 1024):
+                    h.update(chunk)
+            else:
+                for offset in (0, (size - self.hash_block) // 2, size - self.hash_block):
+                    f.seek(offset)
+                    h.update(f.read(self.hash_block))
+        return h.hexdigest()
+
+    def _pack(self, abs_path, info, feature):
+        """去重缓存条目：元数据按 info_reusable 顺序拼成一个字符串，特征向量存成 float32 字节"""
+        values = "\x1f".join(str(info.get(k) or "") for k in self.info_reusable)
+        if feature is not None:
+            feature = np.asarray(feature, dtype=np.float32).tobytes()
+        return abs_path, values, feature
+
+    def _unpack(self, entry):
+        abs_path, values, feature = entry
+        info = {k: v for k, v in zip(self.info_reusable, values.split("\x1f")) if v}
+        if feature is not None:
+            feature = np.frombuffer(feature, dtype=np.float32).tolist()
+        return abs_path, info, feature
+
+    def _lookup_content(self, content_hash: str):
+        with self.rwlock.gen_rlock():
+            cached = self.content_cache.get(content_hash)
+        if cached is not None:
+            return cached
+        uid = self.known.get(content_hash)
+        if uid is None or self.reuse is None:
+            return None
+        # 已入库的内容不常驻内存，命中时按 uid 回库取；取出的条目不写回缓存
+        row = self.reuse(uid)
+        if row is None:
+            return None
+        return self._pack(row["abs_path"], row["info"], row["feature"])
+
+    def _reuse_content(self, content_hash: str, file_path: Path):
+        """查找同内容文件已解析的元数据，开启校验时用全量哈希确认"""
+        cached = self._lookup_content(content_hash)
+        source = cached[0] if cached is not None else None
+        if cached is None or not self.verify_hash or source == str(file_path):
+            return cached, content_hash
+
+        full_hash = self._fingerprint(file_path, full=True)
         try:
-            stat = file_path.stat()
-            relative_path = str(file_path.relative_to(root_path))
+            if source not in self.full_hashes:
+                self.full_hashes[source] = self._fingerprint(Path(source), full=True)
+        except OSError:
+            return None, full_hash
+        if self.full_hashes[source] != full_hash:
+            # 采样指纹碰撞，用全量哈希单独归组
+            return None, full_hash
+        return cached, content_hash
+
+    def _fetch_path_info(self, file_path: Path, root_path: Path, root_name: str):
+        # 多根时 rel_path 带根名前缀，uid 也随之区分不同根下的同名路径
+        relative_path = library.join(root_name, str(file_path.relative_to(root_path)))
+        return {
+            "uid": hashlib.md5(relative_path.encode("utf-8")).hexdigest(),
+            "rel_path": relative_path,
+            "abs_path": str(file_path),
+            "name": file_path.name,
+            "ext": file_path.suffix.lower(),
+            "size": file_path.stat().st_size
+        }
+
+    def _fetch_static_info(self, file_path: Path, root_path: Path, root_name: str):
+        info = {}
+        try:
+            with self.stats.timer("tinytag"):
+                tt = TinyTag.get(file_path)
+            for k, v in tt.as_dict().items():
+                if k in self.info_required and v is not None:
+                    info[k] = str(v[0]) if isinstance(v, list) else str(v)
+        except Exception:
             info = {}
+            self.stats.count("tinytag_error")
+        if not info:
+            self.stats.count("mutagen_fallback")
             try:
-                tt = TinyTag.get(file_path)
-                for k, v in tt.as_dict().items():
-                    if k in self.info_required and v is not None:
-                        info[k] = str(v[0]) if isinstance(v, list) else str(v)
-            except Exception:
-                info = {}
-                pass
-            if not info:
-                try:
+                with self.stats.timer("mutagen"):
                     audio = File(file_path)
-                    info["duration"] = str(getattr(audio.info, "length", ""))
-                    info["channels"] = str(getattr(audio.info, "channels", ""))
-                    info["bitrate"] = str(getattr(audio.info, "bitrate", 0)/1000.0)
-                    info["samplerate"] = str(getattr(audio.info, "sample_rate", ""))
-                    info["bitdepth"] = str(getattr(audio.info, "bits_per_sample", ""))
-                    # for label in ["TIT2", "TPE1", "TALB", "TCON", "title", "artist", "album", "genre"]:
-                    #     if label in audio.tags:
-                    #         tags += audio.tags[label].text[0].split("()–-_+@[]~$%^&!.<>.:=")
-                    for label in ["TBPM", "bpm"]:
-                        if label in audio.tags:
-                            info["bpm"] = audio.tags[label].text[0]
-                    for label in ["TDRC", "date"]:
-                        if label in audio.tags:
-                            info["year"] = audio.tags[label].text[0]
-                except Exception:
-                    pass
-            info.update({
-                "uid": hashlib.md5(relative_path.encode("utf-8")).hexdigest(),
-                "rel_path": relative_path,
-                "abs_path": str(file_path),
-                "name": file_path.name,
-                "ext": file_path.suffix.lower(),
-                "size": stat.st_size
-            })
-            return info
-        except Exception as e:
-            print(f"⚠️ 处理文件失败 {file_path}: {e}")
-            return {}, []
+                info["duration"] = str(getattr(audio.info, "length", ""))
+                info["channels"] = str(getattr(audio.info, "channels", ""))
+                info["bitrate"] = str(getattr(audio.info, "bitrate", 0)/1000.0)
+                info["samplerate"] = str(getattr(audio.info, "sample_rate", ""))
+                info["bitdepth"] = str(getattr(audio.info, "bits_per_sample", ""))
+                # for label in ["TIT2", "TPE1", "TALB", "TCON", "title", "artist", "album", "genre"]:
+                #     if label in audio.tags:
+                #         tags += audio.tags[label].text[0].split("()–-_+@[]~$%^&!.<>.:=")
+                for label in ["TBPM", "bpm"]:
+                    if label in audio.tags:
+                        info["bpm"] = audio.tags[label].text[0]
+                for label in ["TDRC", "date"]:
+                    if label in audio.tags:
+                        info["year"] = audio.tags[label].text[0]
+            except Exception:
+                self.stats.count("mutagen_error")
+        info.update(self._fetch_path_info(file_path, root_path, root_name))
+        return info
     
     def _fetch_info_by_cut(self, file_path: Path, root_path: Path, file_info: dict):
+        self._load_models()
         relative_path = str(file_path.relative_to(root_path))
         path_split = relative_path.split("/")
         words = set()
@@ -377,7 +474,7 @@ class SoundScanner:
                             words.add(w)
                             words.add(w.lower())
             else:
-                for t in jieba.lcut(blk):
+                for t in self.jieba.lcut(blk):
                     word = t.strip("()–-_+@[]~$%^&!.<>.:='")
                     if word:
                         word_split = self._re_split_word(word)
@@ -0,0 +1,62 @@
+import numpy as np
+from readerwriterlock import rwlock
+from extensions.ext_duck import db_sound
+
+
+class SimilarIndex:
+    """
+    特征向量的内存索引，首次查询时从 DuckDB 加载，暴力余弦相似度检索
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.rwlock = rwlock.RWLockWrite()
+        self.uids = None
+        self.matrix = None
+        self.positions = {}
+        # 影子库替换进来后特征向量要重新加载
+        db.add_reload_hook(self.invalidate)
+
+    def invalidate(self):
+        with self.rwlock.gen_wlock():
+            self.uids = None
+            self.matrix = None
+            self.positions = {}
+
+    def _load(self):
+        uids, vectors = self.db.get_features()
+        if not uids:
+            return [], np.zeros((0, 0), dtype=np.float32), {}
+        matrix = np.vstack(vectors).astype(np.float32)
+        # 逐维标准化，避免 MFCC 第 0 维主导距离
+        std = matrix.std(axis=0)
+        std[std == 0] = 1.0
+        matrix = (matrix - matrix.mean(axis=0)) / std
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        return uids, matrix, {uid: i for i, uid in enumerate(uids)}
+
+    def search(self, uid, limit):
+        with self.rwlock.gen_rlock():
+            loaded = self.uids is not None
+        if not loaded:
+            with self.rwlock.gen_wlock():
+                if self.uids is None:
+                    self.uids, self.matrix, self.positions = self._load()
+
+        with self.rwlock.gen_rlock():
+            pos = self.positions.get(uid)
+            if pos is None:
+                return []
+            scores = self.matrix @ self.matrix[pos]
+            scores[pos] = -np.inf
+            k = min(limit, len(self.uids) - 1)
+            if k <= 0:
+                return []
+            idx = np.argpartition(-scores, k - 1)[:k]
+            idx = idx[np.argsort(-scores[idx])]
+            return [(self.uids[i], float(scores[i])) for i in idx]
+
+
+similar_index = SimilarIndex(db_sound)
@@ -1,10 +1,12 @@
 from .ext_duck import db_sound, db_collection
 from .ext_opendal import storage
 from .ext_restx import api
+from .ext_metrics import request_metrics
 
 exts = [
     db_sound,
     db_collection,
     storage,
-    api
+    api,
+    request_metrics,
 ]
\ No newline at end of file
@@ -1,19 +1,177 @@
+import hashlib
+import heapq
+import logging
 import os
+import random
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
 import duckdb
 import pandas as pd
 from readerwriterlock import rwlock
-from config import DATA_DIR
+from config import DATA_DIR, ROW_CACHE_SIZE, SHARD_TIMEOUT, SHARD_WORKERS, SLOW_QUERY_MS, SOUND_DB_READ_ONLY, SWAP_CHECK_INTERVAL
+from core.library import library
+from core.metrics import metrics
+from core.row_cache import RowCache
+
+slow_logger = logging.getLogger("catchsound.slow_query")
+
+SOUND_COLUMNS = [
+    "uid", "abs_path", "rel_path", "name", "ext", "size", "duration", "channels",
+    "bitrate", "bitdepth", "samplerate", "bpm", "year", "key", "oneshot", "tags",
+]
+SOUND_SELECT = ", ".join(SOUND_COLUMNS)
+
+
+def sound_projection(fields):
+    """
+    请求里的 fields 转成要查询的列：列名会拼进 SQL，只认 SOUND_COLUMNS 里的，
+    保持请求顺序，支持列表或逗号分隔的字符串，为空时返回全部列
+    """
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    columns = [c for c in dict.fromkeys(f.strip() for f in fields or []) if c in SOUND_COLUMNS]
+    return columns or SOUND_COLUMNS
+
+
+def project_rows(rows, fields):
+    """按 fields 裁剪已经查出来的整行（按路径 / uid 查询时），fields 为空时原样返回"""
+    if not fields:
+        return rows
+    columns = sound_projection(fields)
+    return [{c: row[c] for c in columns} for row in rows]
 
 
 class DuckDBWALManager:
     
-    def __init__(self, db_name):
+    def __init__(self, db_name, read_only=False):
+        self.db_name = db_name
         self.db_path = os.path.join(DATA_DIR, db_name)
+        self.read_only = read_only
+        self.local = threading.local()
+        self.rwlock =  rwlock.RWLockWrite()
+        self.connect_lock = threading.Lock()
+        self._conn = None
+        self.inode = None
+        self.checked_at = 0.0
+        self.reload_hooks = []
+        # 各线程的 cursor 只弱引用：线程结束后它的 cursor 随 threading.local 一起释放；
+        # 库被替换时 epoch 加一，各线程下次读时换新 cursor
+        self.cursors = weakref.WeakSet()
+        self.epoch = 0
     
     def init_app(self, app):
-        self.conn = duckdb.connect(self.db_path)
-        self.rwlock =  rwlock.RWLockWrite()
-        self.setup_database()
+        # 第一次查询时才连接，flask rescan --shadow 之类的命令不会去抢正式库的文件锁
+        pass
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            with self.connect_lock:
+                if self._conn is None:
+                    self._connect()
+        return self._conn
+
+    def _connect(self):
+        if self.read_only and not os.path.exists(self.db_path):
+            # 只读打开不存在的库会报错，先建一个空库
+            conn = duckdb.connect(self.db_path)
+            self._conn = conn
+            self.setup_database()
+            conn.close()
+        # 先记 inode 再连接，连接期间恰好被替换的话下次检查会再重连一次
+        self.inode = os.stat(self.db_path).st_ino if os.path.exists(self.db_path) else None
+        self._conn = duckdb.connect(self.db_path, read_only=self.read_only)
+        if not self.read_only:
+            self.setup_database()
+        self.checked_at = time.monotonic()
+
+    def add_reload_hook(self, hook):
+        """库文件被替换并重连后调用，用于清掉基于旧数据的内存索引和缓存"""
+        self.reload_hooks.append(hook)
+
+    def _maybe_reload(self, wait=True):
+        """
+        库文件被替换时重连，返回当前连接是否已是最新的库；
+        wait=False 时只检查不重连（不能阻塞的事件循环里用），发现被替换就返回 False，留给下一次查询去重连
+        """
+        now = time.monotonic()
+        if self._conn is None or now - self.checked_at < SWAP_CHECK_INTERVAL:
+            return True
+        try:
+            inode = os.stat(self.db_path).st_ino
+        except FileNotFoundError:
+            self.checked_at = now
+            return True
+        if inode == self.inode:
+            self.checked_at = now
+            return True
+        if not wait:
+            return False
+        self.checked_at = now
+        # 同一进程里只要旧连接和它派生的 cursor 还开着，DuckDB 按路径复用的还是旧库实例，
+        # 所以拿写锁等在途查询结束，关掉全部旧 cursor 和连接后再连新文件
+        with self.rwlock.gen_wlock():
+            if inode == self.inode:
+                return True
+            self._close_cursors()
+            self._conn.close()
+            # 换进来的影子库由同一套代码建表，不用再 setup_database
+            self.inode = inode
+            self._conn = duckdb.connect(self.db_path, read_only=self.read_only)
+        metrics.inc("catchsound_db_reloads_total", db=self.db_name)
+        print(f"🔄 {self.db_name} 已被替换，重新连接")
+        for hook in self.reload_hooks:
+            hook()
+        return True
+
+    def _close_cursors(self):
+        for cursor in list(self.cursors):
+            cursor.close()
+        self.cursors = weakref.WeakSet()
+        self.epoch += 1
+
+    def close(self):
+        self._close_cursors()
+        if self._conn is not None:
+            if not self.read_only:
+                self._conn.execute("CHECKPOINT")
+            self._conn.close()
+            self._conn = None
+
+    def shadow(self):
+        """同目录下的影子库，写完后用 swap_in 原子替换当前库"""
+        shadow = DuckDBWALManager(self.db_name + ".shadow")
+        for path in (shadow.db_path, shadow.db_path + ".wal"):
+            if os.path.exists(path):
+                os.remove(path)
+        return shadow
+
+    def swap_in(self, shadow):
+        """用写好的影子库替换当前库，正在服务的进程会在下次查询时发现 inode 变化并重连"""
+        shadow.close()
+        # 旧库的 WAL 不能留下，否则重连时会被回放到新库上
+        if os.path.exists(self.db_path + ".wal"):
+            os.remove(self.db_path + ".wal")
+        os.replace(shadow.db_path, self.db_path)
+
+    def export_parquet(self, path):
+        """导出为 zstd 压缩的 Parquet 快照，返回行数"""
+        target = path.replace("'", "''")
+        with self._reading() as cursor:
+            cursor.execute(
+                f"COPY (SELECT * FROM sound_index ORDER BY abs_path) TO '{target}' (FORMAT PARQUET, COMPRESSION ZSTD)"
+            )
+            return cursor.execute(f"SELECT COUNT(*) FROM read_parquet('{target}')").fetchone()[0]
+
+    def load_parquet(self, path):
+        """从 Parquet 快照导入，老快照缺的列按列名补空"""
+        conn = self.conn
+        with self.rwlock.gen_wlock():
+            conn.execute("INSERT INTO sound_index BY NAME SELECT * FROM read_parquet(?) ON CONFLICT (uid) DO NOTHING", [path])
+        return conn.execute("SELECT COUNT(*) FROM sound_index").fetchone()[0]
 
     def setup_database(self):
         """初始化数据库结构"""
@@ -43,72 +201,99 @@ class DuckDBWALManager:
             self.conn.execute("CREATE INDEX IF NOT EXISTS idx_uid ON sound_index(uid)")
             self.conn.execute("CREATE INDEX IF NOT EXISTS idx_abs_path ON sound_index(abs_path)")
 
+            # 相似检索用的特征向量，老库补列
+            self.conn.execute("ALTER TABLE sound_index ADD COLUMN IF NOT EXISTS feature FLOAT[]")
+            # 内容指纹，用于跨包去重
+            self.conn.execute("ALTER TABLE sound_index ADD COLUMN IF NOT EXISTS content_hash VARCHAR")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_content_hash ON sound_index(content_hash)")
+
     def batch_insert(self, rows):
+        """写入失败（比如只读打开）直接抛出，调用方据此决定是否替换正式库"""
         df = pd.DataFrame(rows)
+        for col in ["feature", "content_hash"]:
+            if col not in df.columns:
+                df[col] = None
+        # 先取连接再拿写锁，首次连接会在 setup_database 里拿同一把锁
+        conn = self.conn
+        with self.rwlock.gen_wlock():
+            conn.execute("SET preserve_insertion_order = false")
+            conn.execute("SET checkpoint_threshold = '1GB'")
+            conn.execute("SET threads = 8")
+            # 已有的行保持不变，只给老库升级后还没有特征向量 / 内容指纹的行补上
+            conn.execute("INSERT INTO sound_index SELECT \
+                            uid, abs_path, rel_path, name, ext, size, duration, channels, bitrate, bitdepth, \
+                            samplerate, bpm, year, key, oneshot, tags, feature, content_hash \
+                            FROM df ON CONFLICT (uid) DO UPDATE SET \
+                            feature = COALESCE(sound_index.feature, excluded.feature), \
+                            content_hash = COALESCE(sound_index.content_hash, excluded.content_hash) \
+                            WHERE sound_index.feature IS NULL OR sound_index.content_hash IS NULL")
+            
+    def _cursor(self):
+        """DuckDB 连接对象不是线程安全的，每个线程用自己的 cursor 读；库被替换后 cursor 跟着换"""
+        conn = self.conn
+        if getattr(self.local, "epoch", None) != self.epoch:
+            self.local.cursor = conn.cursor()
+            self.local.epoch = self.epoch
+            self.cursors.add(self.local.cursor)
+        return self.local.cursor
+
+    @contextmanager
+    def _reading(self):
+        """读期间持有读锁，库文件被替换时等在途的读结束后才关旧连接"""
+        self._maybe_reload()
+        # 首次连接会拿写锁建表，要在读锁外面完成
+        self.conn
+        with self.rwlock.gen_rlock():
+            yield self._cursor()
+
+    def _query(self, op, sql, params=None, columns=SOUND_COLUMNS):
+        """执行查询并记录 DuckDB 执行 / 取数 / 行转换三段耗时，超过阈值写慢查询日志"""
+        with self._reading() as cursor:
+            start = time.perf_counter()
+            result = cursor.execute(sql, params)
+            executed = time.perf_counter()
+            rows = result.fetchall()
+            fetched = time.perf_counter()
+            final_result = [dict(zip(columns, row)) for row in rows]
+            done = time.perf_counter()
+            if (done - start) * 1000 > SLOW_QUERY_MS:
+                self._log_slow_query(cursor, op, sql, params, done - start, len(rows))
+
+        labels = {"db": self.db_name, "op": op}
+        metrics.observe("catchsound_db_seconds", executed - start, phase="execute", **labels)
+        metrics.observe("catchsound_db_seconds", fetched - executed, phase="fetch", **labels)
+        metrics.observe("catchsound_db_seconds", done - fetched, phase="convert", **labels)
+        metrics.inc("catchsound_db_rows_total", len(rows), **labels)
+        return final_result
+
+    def _log_slow_query(self, cursor, op, sql, params, seconds, n_rows):
+        # EXPLAIN ANALYZE 会把查询再跑一遍，只在超过阈值时才做
         try:
-            with self.rwlock.gen_wlock():
-                self.conn.execute("SET preserve_insertion_order = false")
-                self.conn.execute("SET checkpoint_threshold = '1GB'")
-                self.conn.execute("SET threads = 8")
-                self.conn.execute("INSERT INTO sound_index SELECT \
-                                uid, abs_path, rel_path, name, ext, size, duration, channels, bitrate, bitdepth, \
-                                samplerate, bpm, year, key, oneshot, tags \
-                                FROM df ON CONFLICT (uid) DO NOTHING")
+            plan = "\n".join(row[1] for row in cursor.execute("EXPLAIN ANALYZE " + sql, params).fetchall())
         except Exception as e:
-            print(f"❌ 批量插入失败: {e}")
-            
-    def get_sound_by_or_tags(self, tags, oneshot, key, limit, offset, rand):
+            plan = f"EXPLAIN ANALYZE failed: {e}"
+        slow_logger.warning(
+            "%s %s %.1fms rows=%d\nSQL: %s\nparams: %s\n%s",
+            self.db_name, op, seconds * 1000, n_rows, " ".join(sql.split()), params, plan
+        )
+
+    def get_sound_by_or_tags(self, tags, oneshot, key, limit, offset, rand, collapse=False, fields=None):
         tags_stc = ""
         for tag in tags:
             tags_stc += f" OR array_contains(tags,'{tag}')"
         if tags_stc:
             tags_stc = '(' + tags_stc.strip(" OR ") + ')'
-            
-        oneshot_stc = ""
-        if oneshot:
-            oneshot_stc = f" AND oneshot='{oneshot}'"
-            
-        key_stc = ""
-        if key:
-            key_stc = f" AND key='{key}'"
-        
-        where_stc = tags_stc + oneshot_stc + key_stc
-        where_stc = where_stc.strip(" AND ")
-        
-        order_stc = "abs_path"
-        if rand:
-            order_stc = "RANDOM()"
-
-        if where_stc:
-            result = self.conn.execute(
-                f"SELECT uid, abs_path, rel_path, name, ext, size, duration, channels, bitrate, bitdepth, \
-                samplerate, bpm, year, key, oneshot, tags FROM sound_index WHERE {where_stc} \
-                ORDER BY {order_stc} LIMIT {limit} OFFSET {offset}"
-            )
-        else:
-            result = self.conn.execute(
-                f"SELECT uid, abs_path, rel_path, name, ext, size, duration, channels, bitrate, bitdepth, \
-                samplerate, bpm, year, key, oneshot, tags FROM sound_index \
-                ORDER BY {order_stc} LIMIT {limit} OFFSET {offset}"
-            )
+        return self._get_sound_by_where(tags_stc, oneshot, key, limit, offset, rand, collapse, fields, "or_tags")
 
-        final_result = []
-        while True:
-            row = result.fetchone()
-            if row is None:
-                break
-            final_result.append(dict(zip([
-                "uid", "abs_path", "rel_path", "name", "ext", "size", "duration", "channels", 
-                "bitrate", "bitdepth", "samplerate", "bpm", "year", "key", "oneshot", "tags"], row)))
-        return final_result
-    
-    def get_sound_by_and_tags(self, tags, oneshot, key, limit, offset, rand):
+    def get_sound_by_and_tags(self, tags, oneshot, key, limit, offset, rand, collapse=False, fields=None):
         tags_stc = ""
         for tag in tags:
             tags_stc += f" AND array_contains(tags,'{tag}')"
         if tags_stc:
             tags_stc = '(' + tags_stc.strip(" AND ") + ')'
-            
+        return self._get_sound_by_where(tags_stc, oneshot, key, limit, offset, rand, collapse, fields, "and_tags")
+
+    def _get_sound_by_where(self, tags_stc, oneshot, key, limit, offset, rand, collapse, fields, op):
         oneshot_stc = ""
         if oneshot:
             oneshot_stc = f" AND oneshot='{oneshot}'"
@@ -119,53 +304,282 @@ class DuckDBWALManager:
         
         where_stc = tags_stc + oneshot_stc + key_stc
         where_stc = where_stc.strip(" AND ")
+        if where_stc:
+            where_stc = "WHERE " + where_stc
         
         order_stc = "abs_path"
         if rand:
             order_stc = "RANDOM()"
-        
-        if where_stc:
-            result = self.conn.execute(
-                f"SELECT uid, abs_path, rel_path, name, ext, size, duration, channels, bitrate, bitdepth, \
-                samplerate, bpm, year, key, oneshot, tags FROM sound_index WHERE {where_stc} \
-                ORDER BY {order_stc} LIMIT {limit} OFFSET {offset}"
-            )
-        else:
-            result = self.conn.execute(
-                f"SELECT uid, abs_path, rel_path, name, ext, size, duration, channels, bitrate, bitdepth, \
-                samplerate, bpm, year, key, oneshot, tags FROM sound_index \
-                ORDER BY {order_stc} LIMIT {limit} OFFSET {offset}"
-            )
 
-        final_result = []
-        while True:
-            row = result.fetchone()
-            if row is None:
-                break
-            final_result.append(dict(zip([
-                "uid", "abs_path", "rel_path", "name", "ext", "size", "duration", "channels", 
-                "bitrate", "bitdepth", "samplerate", "bpm", "year", "key", "oneshot", "tags"], row)))
-        return final_result
+        # 内容相同的文件只保留路径最靠前的一个
+        collapse_stc = ""
+        if collapse:
+            collapse_stc = "QUALIFY ROW_NUMBER() OVER (PARTITION BY COALESCE(content_hash, uid) ORDER BY abs_path) = 1"
+
+        # 只取需要的列，少读 tags 这类大列，也少转换和序列化
+        columns = sound_projection(fields)
+        return self._query(
+            op,
+            f"SELECT {', '.join(columns)} FROM sound_index {where_stc} {collapse_stc} \
+            ORDER BY {order_stc} LIMIT {limit} OFFSET {offset}",
+            columns=columns
+        )
     
     def get_sound_by_uid(self, uid):
-        result = self.conn.execute(
-            f"SELECT uid, abs_path, rel_path, name, ext, size, duration, channels, bitrate, bitdepth, \
-            samplerate, bpm, year, key, oneshot, tags FROM sound_index WHERE uid='{uid}'"
+        return self._query("uid", f"SELECT {SOUND_SELECT} FROM sound_index WHERE uid = ?", [uid])
+
+    def get_sound_by_uids(self, uids):
+        if not uids:
+            return []
+        rows = self._query(
+            "uids", f"SELECT {SOUND_SELECT} FROM sound_index WHERE uid IN (SELECT UNNEST(?))", [list(uids)]
         )
-        final_result = []
-        while True:
-            row = result.fetchone()
-            if row is None:
-                break
-            final_result.append(dict(zip([
-                "uid", "abs_path", "rel_path", "name", "ext", "size", "duration", "channels", 
-                "bitrate", "bitdepth", "samplerate", "bpm", "year", "key", "oneshot", "tags"], row)))
-        return final_result
+        rows = {row["uid"]: row for row in rows}
+        return [rows[uid] for uid in uids if uid in rows]
+
+    def get_content_hash(self, uid):
+        with self._reading() as cursor:
+            row = cursor.execute("SELECT content_hash FROM sound_index WHERE uid = ?", [uid]).fetchone()
+        return row[0] if row else None
+
+    def get_sound_by_content_hash(self, content_hash):
+        return self._query(
+            "duplicates",
+            f"SELECT {SOUND_SELECT} FROM sound_index WHERE content_hash = ? ORDER BY abs_path",
+            [content_hash]
+        )
+
+    def get_uids_by_content_hash(self):
+        """content_hash -> 任一同内容的 uid；只有两个短字符串，元数据和特征命中时再用 get_reusable_by_uid 取"""
+        with self._reading() as cursor:
+            rows = cursor.execute(
+                "SELECT content_hash, ANY_VALUE(uid) FROM sound_index WHERE content_hash IS NOT NULL GROUP BY content_hash"
+            ).fetchall()
+        return dict(rows)
+
+    def get_reusable_by_uid(self, uid):
+        """重扫时同内容文件可以直接复用的元数据和特征向量"""
+        with self._reading() as cursor:
+            row = cursor.execute(
+                "SELECT abs_path, duration, channels, bitrate, bitdepth, samplerate, bpm, year, feature \
+                FROM sound_index WHERE uid = ?", [uid]
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "abs_path": row[0],
+            "info": dict(zip(["duration", "channels", "bitrate", "bitdepth", "samplerate", "bpm", "year"], row[1:8])),
+            "feature": row[8],
+        }
+
+    def get_features(self):
+        with self._reading() as cursor:
+            df = cursor.execute(
+                "SELECT uid, feature FROM sound_index WHERE feature IS NOT NULL"
+            ).df()
+        return df["uid"].tolist(), df["feature"].tolist()
 
     def del_by_uid(self, uid):
+        self.del_by_uids([uid])
+
+    def del_by_uids(self, uids):
+        conn = self.conn
         with self.rwlock.gen_wlock():
-            self.conn.execute(f"DELETE FROM sound_index WHERE uid='{uid}'")
+            conn.execute("DELETE FROM sound_index WHERE uid IN (SELECT UNNEST(?))", [list(uids)])
+
+
+class ShardedSoundDB:
+    """
+    每个库根一个 DuckDB 分片，对外接口和 DuckDBWALManager 一致：查询并行发到各分片再合并，
+    超过 SHARD_TIMEOUT 的分片直接丢弃结果，不拖慢其他分片；只有一个分片时直接调用不走线程池
+    """
+
+    def __init__(self, library, read_only=False):
+        self.shards = {
+            name: DuckDBWALManager(library.db_name(name), read_only=read_only) for name in library.roots
+        }
+        # 每个分片一个线程池，超时的查询只会占住自己分片的线程
+        self.executors = {
+            name: ThreadPoolExecutor(max_workers=SHARD_WORKERS, thread_name_prefix=f"shard-{name}")
+            for name in self.shards
+        }
+        self.inflight = {name: 0 for name in self.shards}
+        self.inflight_lock = threading.Lock()
+        # 按 uid 查整行的结果都过这层缓存，库被替换后整体失效
+        self.row_cache = RowCache(ROW_CACHE_SIZE)
+        self.add_reload_hook(self.row_cache.clear)
+
+    def init_app(self, app):
+        for shard in self.shards.values():
+            shard.init_app(app)
+
+    def shard(self, name):
+        return self.shards[name]
+
+    def add_reload_hook(self, hook):
+        for shard in self.shards.values():
+            shard.add_reload_hook(hook)
+
+    def _fan_out(self, op, method, *args):
+        """在每个分片上调用 method，返回按分片顺序排列的结果列表（超时或出错的分片不在其中）"""
+        if len(self.shards) == 1:
+            return [getattr(shard, method)(*args) for shard in self.shards.values()]
+        futures = {}
+        for name, shard in self.shards.items():
+            future = self._submit(name, getattr(shard, method), *args)
+            if future is None:
+                # 这个分片的在途查询已满（多半是慢的网络盘），不再往上排队
+                metrics.inc("catchsound_shard_skipped_total", shard=name, op=op, reason="busy")
+                continue
+            futures[future] = name
+        done, not_done = wait(futures, timeout=SHARD_TIMEOUT)
+        results = []
+        for future, name in futures.items():
+            if future in not_done:
+                future.cancel()
+                metrics.inc("catchsound_shard_skipped_total", shard=name, op=op, reason="timeout")
+                slow_logger.warning("shard %s %s timed out after %.1fs, skipped", name, op, SHARD_TIMEOUT)
+            elif future.exception() is not None:
+                metrics.inc("catchsound_shard_skipped_total", shard=name, op=op, reason="error")
+                slow_logger.warning("shard %s %s failed: %s", name, op, future.exception())
+            else:
+                results.append(future.result())
+        return results
+
+    def _submit(self, name, fn, *args):
+        """在分片自己的线程池里执行，在途数达到 SHARD_WORKERS 时返回 None"""
+        with self.inflight_lock:
+            if self.inflight[name] >= SHARD_WORKERS:
+                return None
+            self.inflight[name] += 1
+        future = self.executors[name].submit(fn, *args)
+        future.add_done_callback(lambda _, name=name: self._release(name))
+        return future
+
+    def _release(self, name):
+        with self.inflight_lock:
+            self.inflight[name] -= 1
+
+    def _merge_page(self, results, limit, offset, rand):
+        """各分片按 abs_path 有序，归并后再分页；随机时各分片各取 limit 条混洗"""
+        if rand:
+            rows = [row for rows in results for row in rows]
+            random.shuffle(rows)
+            return rows[:limit]
+        merged = heapq.merge(*results, key=lambda row: row["abs_path"])
+        return list(merged)[offset:offset + limit]
+
+    def _get_sound_by_tags(self, op, tags, oneshot, key, limit, offset, rand, collapse, fields):
+        method = f"get_sound_by_{op}"
+        if len(self.shards) == 1:
+            return self._fan_out(op, method, tags, oneshot, key, limit, offset, rand, collapse, fields)[0]
+        # 归并要按 abs_path 排序，没请求这一列时临时带上，合并完再去掉
+        columns = sound_projection(fields)
+        extra = "abs_path" not in columns
+        if extra:
+            columns = columns + ["abs_path"]
+        # 跨分片分页：每个分片取前 offset + limit 条，归并后再切
+        results = self._fan_out(
+            op, method, tags, oneshot, key, limit + (0 if rand else offset), 0, rand, collapse, columns
+        )
+        rows = self._merge_page(results, limit, offset, rand)
+        if extra:
+            for row in rows:
+                del row["abs_path"]
+        return rows
+
+    def get_sound_by_or_tags(self, tags, oneshot, key, limit, offset, rand, collapse=False, fields=None):
+        return self._get_sound_by_tags("or_tags", tags, oneshot, key, limit, offset, rand, collapse, fields)
+
+    def get_sound_by_and_tags(self, tags, oneshot, key, limit, offset, rand, collapse=False, fields=None):
+        return self._get_sound_by_tags("and_tags", tags, oneshot, key, limit, offset, rand, collapse, fields)
+
+    def get_sound_by_uid(self, uid):
+        return self.get_sound_by_uids([uid])
+
+    def get_sound_by_path(self, path):
+        return self.get_sound_by_paths([path])
+
+    def get_sound_by_paths(self, paths):
+        """按库路径批量查询：每个分片一条 IN 查询，不用扇出，结果按请求顺序"""
+        by_shard = {}
+        uids = []
+        for path in paths:
+            name, _ = library.resolve(path)
+            if name is None:
+                continue
+            uid = hashlib.md5(path.encode("utf-8")).hexdigest()
+            by_shard.setdefault(name, []).append(uid)
+            uids.append(uid)
+        rows = self._cached(uids, lambda missing: [
+            row for name, shard_uids in by_shard.items()
+            for row in self.shards[name].get_sound_by_uids([uid for uid in shard_uids if uid in missing])
+        ])
+        return [rows[uid] for uid in uids if uid in rows]
+
+    def get_sound_by_uids(self, uids):
+        if not uids:
+            return []
+        rows = self._cached(uids, lambda missing: [
+            row for rows in self._fan_out("uids", "get_sound_by_uids", list(missing)) for row in rows
+        ])
+        return [rows[uid] for uid in uids if uid in rows]
+
+    def _fresh(self, wait=True):
+        """缓存命中不走 _reading，先检查各分片是否被替换，替换后的重连会清掉缓存"""
+        return all([shard._maybe_reload(wait) for shard in self.shards.values()])
+
+    def get_cached_by_path(self, path):
+        """只查缓存不碰 DuckDB，异步模式下命中时不用进线程池；库刚被替换时返回空，交给线程池里的查询去重连"""
+        if not self._fresh(wait=False):
+            return []
+        found, _ = self.row_cache.get_many([hashlib.md5(path.encode("utf-8")).hexdigest()])
+        return [dict(row) for row in found.values()]
+
+    def _cached(self, uids, fetch):
+        """先查缓存，未命中的 uid 交给 fetch 一次查完并写回；返回副本，调用方可以随意改"""
+        self._fresh()
+        generation = self.row_cache.generation
+        rows, missing = self.row_cache.get_many(uids)
+        if missing:
+            fetched = fetch(set(missing))
+            self.row_cache.put_many(fetched, generation)
+            rows.update((row["uid"], row) for row in fetched)
+        return {uid: dict(row) for uid, row in rows.items()}
+
+    def get_duplicates_by_uid(self, uid):
+        hashes = [h for h in self._fan_out("content_hash", "get_content_hash", uid) if h]
+        if not hashes:
+            return []
+        results = self._fan_out("duplicates", "get_sound_by_content_hash", hashes[0])
+        return list(heapq.merge(*results, key=lambda row: row["abs_path"]))
+
+    def get_uids_by_content_hash(self):
+        uids = {}
+        for shard in self.shards.values():
+            uids.update(shard.get_uids_by_content_hash())
+        return uids
+
+    def get_reusable_by_uid(self, uid):
+        for shard in self.shards.values():
+            row = shard.get_reusable_by_uid(uid)
+            if row is not None:
+                return row
+        return None
+
+    def get_features(self):
+        uids, vectors = [], []
+        for shard in self.shards.values():
+            shard_uids, shard_vectors = shard.get_features()
+            uids += shard_uids
+            vectors += shard_vectors
+        return uids, vectors
+
+    def del_by_uid(self, uid):
+        for shard in self.shards.values():
+            shard.del_by_uid(uid)
+        self.row_cache.discard(uid)
 
 
-db_sound = DuckDBWALManager("sound.duck")
+db_sound = ShardedSoundDB(library, read_only=SOUND_DB_READ_ONLY)
 db_collection = DuckDBWALManager("collection.duck")
@@ -0,0 +1,64 @@
+import logging
+import os
+import time
+from flask import g, request
+from flask_restx.representations import output_json
+from config import DATA_DIR
+from core.encoding import MSGPACK_MIMETYPE, output_msgpack
+from core.metrics import metrics
+from extensions.ext_restx import api
+
+
+class RequestMetrics:
+    """
+    记录每个接口的耗时 / 状态码 / JSON 序列化耗时，并把慢查询日志落到 data/slow_query.log
+    """
+
+    def init_app(self, app):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        api.representations["application/json"] = self._timed(output_json, "application/json")
+        # 客户端带 Accept: application/x-msgpack 时走 MessagePack，体积和序列化耗时都更小
+        api.representations[MSGPACK_MIMETYPE] = self._timed(output_msgpack, MSGPACK_MIMETYPE)
+
+        slow_logger = logging.getLogger("catchsound.slow_query")
+        if not slow_logger.handlers:
+            # 新机器上 data 目录可能还不存在（比如先跑 load_snapshot），日志文件等第一次写时再建
+            os.makedirs(DATA_DIR, exist_ok=True)
+            handler = logging.FileHandler(os.path.join(DATA_DIR, "slow_query.log"), delay=True)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            slow_logger.addHandler(handler)
+            slow_logger.setLevel(logging.WARNING)
+            slow_logger.propagate = False
+
+    @staticmethod
+    def _endpoint():
+        return request.url_rule.rule if request.url_rule else "unmatched"
+
+    def _before_request(self):
+        g.metrics_start = time.perf_counter()
+
+    def _after_request(self, response):
+        start = g.pop("metrics_start", None)
+        if start is not None:
+            endpoint = self._endpoint()
+            # 流式响应（/api/file）这里只算到开始返回，传输耗时见 catchsound_file_stream_seconds
+            metrics.observe("catchsound_request_seconds", time.perf_counter() - start,
+                            endpoint=endpoint, method=request.method)
+            metrics.inc("catchsound_requests_total",
+                        endpoint=endpoint, method=request.method, status=response.status_code)
+        return response
+
+    def _timed(self, output, mimetype):
+        def timed_output(data, code, headers=None):
+            start = time.perf_counter()
+            response = output(data, code, headers)
+            metrics.observe("catchsound_serialize_seconds", time.perf_counter() - start,
+                            endpoint=self._endpoint(), mimetype=mimetype)
+            metrics.inc("catchsound_response_bytes_total", response.content_length or 0,
+                        endpoint=self._endpoint(), mimetype=mimetype)
+            return response
+        return timed_output
+
+
+request_metrics = RequestMetrics()
@@ -1,25 +1,62 @@
 import logging
-from collections.abc import Generator
+import os
+from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
-from opendal import Operator
-from config import OPENDAL_FS_ROOT
+from opendal import AsyncOperator, Operator
+from opendal.exceptions import NotFound
+from urllib.parse import quote
+from config import ACCEL_REDIRECT, LIBRARY_ROOTS
+from core.library import library
 
 logger = logging.getLogger(__name__)
 
 
 class OpenDALStorage():
     def init_app(self, app):
-        self.op = Operator(scheme="fs", root=OPENDAL_FS_ROOT)
+        # 每个库根一个 Operator，路径第一段（多根时）决定走哪个
+        self.ops = {}
+        self.async_ops = {}
+        self.offline = set()
+        for name in LIBRARY_ROOTS:
+            self.online(name)
+
+    def online(self, name: str) -> bool:
+        """
+        fs Operator 会把不存在的根目录建出来，没挂载的 NAS 就成了空目录，
+        所以根目录存在时才建 Operator，否则记为离线，下次用到时再检查（挂载上以后自动恢复）
+        """
+        if name in self.ops:
+            return True
+        root = LIBRARY_ROOTS[name]
+        if not os.path.isdir(root):
+            if name not in self.offline:
+                print(f"⚠️ 库根 {name} 不存在或未挂载，标记为离线: {root}")
+            self.offline.add(name)
+            return False
+        self.ops[name] = Operator(scheme="fs", root=root)
+        self.async_ops[name] = AsyncOperator(scheme="fs", root=root)
+        self.offline.discard(name)
+        return True
+
+    def _resolve(self, filename: str, ops: dict):
+        name, path = library.resolve(filename)
+        if name is None:
+            raise FileNotFoundError("Root not found")
+        if not self.online(name):
+            raise FileNotFoundError("Root offline")
+        return ops[name], path or "/"
 
     def save(self, filename: str, data: bytes):
-        self.op.write(path=filename, bs=data)
+        op, path = self._resolve(filename, self.ops)
+        op.write(path=path, bs=data)
         logger.debug("file %s saved", filename)
 
     def load_once(self, filename: str) -> bytes:
         if not self.exists(filename):
             raise FileNotFoundError("File not found")
 
-        content: bytes = self.op.read(path=filename)
+        op, path = self._resolve(filename, self.ops)
+        content: bytes = op.read(path=path)
         logger.debug("file %s loaded", filename)
         return content
 
@@ -28,8 +65,9 @@ class OpenDALStorage():
             raise FileNotFoundError("File not found")
 
         batch_size = 4096
-        with self.op.open(
-            path=filename,
+        op, path = self._resolve(filename, self.ops)
+        with op.open(
+            path=path,
             mode="rb",
             chunck=batch_size,
         ) as file:
@@ -41,15 +79,21 @@ class OpenDALStorage():
         if not self.exists(filename):
             raise FileNotFoundError("File not found")
 
-        Path(target_filepath).write_bytes(self.op.read(path=filename))
+        op, path = self._resolve(filename, self.ops)
+        Path(target_filepath).write_bytes(op.read(path=path))
         logger.debug("file %s downloaded to %s", filename, target_filepath)
 
     def exists(self, filename: str) -> bool:
-        return self.op.exists(path=filename)
+        try:
+            op, path = self._resolve(filename, self.ops)
+        except FileNotFoundError:
+            return False
+        return op.exists(path=path)
 
     def delete(self, filename: str):
         if self.exists(filename):
-            self.op.delete(path=filename)
+            op, path = self._resolve(filename, self.ops)
+            op.delete(path=path)
             logger.debug("file %s deleted", filename)
             return
         logger.debug("file %s not found, skip delete", filename)
@@ -58,17 +102,61 @@ class OpenDALStorage():
         if not self.exists(path):
             raise FileNotFoundError("Path not found")
 
-        all_files = self.op.list(path=path)
+        name, _ = library.resolve(path)
+        op, rel = self._resolve(path, self.ops)
+        all_files = [library.join(name, f.path) for f in op.list(path=rel)]
         if files and directories:
             logger.debug("files and directories on %s scanned", path)
-            return [f.path for f in all_files]
+            return all_files
         if files:
             logger.debug("files on %s scanned", path)
-            return [f.path for f in all_files if not f.path.endswith("/")]
+            return [f for f in all_files if not f.endswith("/")]
         elif directories:
             logger.debug("directories on %s scanned", path)
-            return [f.path for f in all_files if f.path.endswith("/")]
+            return [f for f in all_files if f.endswith("/")]
         else:
             raise ValueError("At least one of files or directories must be True")
 
+    async def aexists(self, filename: str) -> bool:
+        try:
+            op, path = self._resolve(filename, self.async_ops)
+        except FileNotFoundError:
+            return False
+        return await op.exists(path=path)
+
+    async def ais_file(self, filename: str) -> bool:
+        try:
+            op, path = self._resolve(filename, self.async_ops)
+            meta = await op.stat(path=path)
+        except (FileNotFoundError, NotFound):
+            return False
+        return meta.mode.is_file()
+
+    async def aload_stream(self, filename: str) -> AsyncGenerator:
+        if not await self.aexists(filename):
+            raise FileNotFoundError("File not found")
+
+        # 每块都要经过事件循环和 Python，块越小 CPU 越多花在搬运上；512KB 时同样流量下 CPU 少得多
+        batch_size = 512 * 1024
+        op, path = self._resolve(filename, self.async_ops)
+        file = await op.open(path=path, mode="rb")
+        async with file:
+            while chunk := await file.read(batch_size):
+                yield chunk
+        logger.debug("file %s loaded as async stream", filename)
+
+    def accel_path(self, filename: str):
+        """配置了 ACCEL_REDIRECT 时返回交给 nginx 直接发送的内部地址，否则返回 None"""
+        if not ACCEL_REDIRECT:
+            return None
+        return ACCEL_REDIRECT.rstrip("/") + "/" + quote(filename)
+
+    async def alist(self, path: str) -> list[str]:
+        """列出目录，返回的是库路径（多根时带根名前缀）"""
+        name, _ = library.resolve(path)
+        op, rel = self._resolve(path, self.async_ops)
+        entries = await op.list(path=rel)
+        return [library.join(name, entry.path) async for entry in entries]
+
+
 storage = OpenDALStorage()
@@ -5,21 +5,21 @@ const api = axios.create({
   timeout: 10000,
 });
 
-// 音频文件相关接口
+// 音频文件相关接口；列表只请求 LIST_FIELDS 里的列，其余列可能没有
 export interface AudioFile {
   uid: string;
-  abs_path: string;
+  abs_path?: string;
   rel_path: string;
   name: string;
-  ext: string;
-  size: string;
+  ext?: string;
+  size?: string;
   duration: string;
-  channels: string;
-  bitrate: string;
-  bitdepth: string;
-  samplerate: string;
+  channels?: string;
+  bitrate?: string;
+  bitdepth?: string;
+  samplerate?: string;
   bpm: string;
-  year: string;
+  year?: string;
   key: string;
   oneshot: string;
   tags: string[];
@@ -34,6 +34,7 @@ export interface SearchParams {
   key?: string;
   op?: 'AND' | 'OR';
   rand?: boolean;
+  fields?: string[]; // 只返回这些列，不传则返回全部列
   _refresh?: number; // 刷新时间戳，用于强制重新获取随机数据
 }
 
@@ -43,17 +44,54 @@ export interface FileBrowserItem {
   type: 'folder' | 'file';
   subs?: FileBrowserItem[];
   is_current_file?: boolean;
+  offline?: boolean; // 多根时顶层的库根没挂载
 }
 
+// 列表页用到的列，其余列（含服务器绝对路径）不再返回
+const LIST_FIELDS = ['uid', 'name', 'rel_path', 'duration', 'bpm', 'key', 'oneshot', 'tags'];
+
+// 试听时预热之后这么多行的元数据
+const PREFETCH_AHEAD = 10;
+
+// 各列表最近一次展示的路径顺序，试听时据此找出接下来可能要播放的行
+const listedPaths: Record<'sounds' | 'collection' | 'folder', string[]> = { sounds: [], collection: [], folder: [] };
+const prefetched = new Set<string>();
+
+const rememberListing = (list: keyof typeof listedPaths, paths: string[], append: boolean): void => {
+  listedPaths[list] = append ? [...listedPaths[list], ...paths] : paths;
+  if (!append) {
+    prefetched.clear();
+  }
+};
+
+// 预热后端的元数据缓存：只查正在试听的这一行之后的几行，连续试听时不用每次各查一次库，失败不影响播放
+const prefetchAhead = (path: string): void => {
+  for (const paths of Object.values(listedPaths)) {
+    const index = paths.indexOf(path);
+    if (index < 0) {
+      continue;
+    }
+    // 下一行已预热就不发，顺序试听时每 PREFETCH_AHEAD 首才一次批量查询
+    if (index + 1 >= paths.length || prefetched.has(paths[index + 1])) {
+      continue;
+    }
+    const next = paths.slice(index + 1, index + 1 + PREFETCH_AHEAD);
+    next.forEach((p) => prefetched.add(p));
+    api.post('/sounds/batch', { paths: next, fields: ['uid'] }).catch(() => {});
+  }
+};
+
 // 音频文件搜索
 export const searchAudioFiles = async (params: SearchParams): Promise<AudioFile[]> => {
-  const response = await api.post('/sounds', params);
+  const response = await api.post('/sounds', { fields: LIST_FIELDS, ...params });
+  rememberListing('sounds', response.data.map((file: AudioFile) => file.rel_path), !!params.offset);
   return response.data;
 };
 
 // 收藏夹搜索
 export const searchCollectionFiles = async (params: SearchParams): Promise<AudioFile[]> => {
-  const response = await api.post('/collection', params);
+  const response = await api.post('/collection', { fields: LIST_FIELDS, ...params });
+  rememberListing('collection', response.data.map((file: AudioFile) => file.rel_path), !!params.offset);
   return response.data;
 };
 
@@ -70,6 +108,11 @@ export const removeFromCollection = async (path: string): Promise<void> => {
 // 获取文件夹内容
 export const getFolderContents = async (path: string): Promise<FileBrowserItem[]> => {
   const response = await api.post('/tree/folder/content', { path });
+  rememberListing(
+    'folder',
+    response.data.filter((item: FileBrowserItem) => item.type === 'file').map((item: FileBrowserItem) => item.path),
+    false
+  );
   return response.data;
 };
 
@@ -87,6 +130,7 @@ export const getAvailableTags = async (): Promise<string[]> => {
 
 // 获取音频文件流（用于播放）
 export const getAudioStream = async (path: string): Promise<string> => {
+  prefetchAhead(path);
   const response = await api.get('/file', {
     params: { path },
     responseType: 'blob'
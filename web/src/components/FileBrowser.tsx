@@ -840,7 +840,7 @@ const FileBrowser: React.FC<FileBrowserProps> = ({
             "flex items-center py-1 px-2 cursor-pointer hover:bg-accent rounded-sm",
             "transition-colors duration-150",
             isSelected && "bg-primary/10 text-primary",
-            draggedItem?.path === item.path && "opacity-50"
+            (draggedItem?.path === item.path || item.offline) && "opacity-50"
           )}
           style={{ paddingLeft: `${level * 16 + 8}px` }}
           draggable={item.name.match(/\.(mp3|wav|flac|aiff|m4a|ogg)$/i) ? true : false}
@@ -871,7 +871,7 @@ const FileBrowser: React.FC<FileBrowserProps> = ({
               )}
             </>
           )}
-          <span className="text-sm truncate flex-1">{item.name}</span>
+          <span className="text-sm truncate flex-1">{item.name}{item.offline && ' (离线)'}</span>
         </div>
         
         {item.type === 'folder' && isExpanded && item.subs && (